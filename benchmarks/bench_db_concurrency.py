@@ -0,0 +1,105 @@
+"""
+Rules scoring (writer) running while API-style reads hit the same database.
+
+    python -m benchmarks.bench_db_concurrency [--rows 10000] [--readers 4]
+
+Runs the rules-based scoring loop on one thread while reader threads run
+the /leads query until scoring finishes. Compares plain sqlite3
+connections (rollback journal, default settings) against the tuned
+connections from config.database (WAL + pooled read-only readers).
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from benchmarks.bench_lead_loader import build_database
+from config.database import ConnectionPool, connect
+from config.queries import TOP_SCORED_LEADS_QUERY
+from core.lead_scoring_model import rules_based_baseline as rules
+
+def run_writer(conn, done: threading.Event, stats: dict):
+    rules.ensure_tables(conn)
+    start = time.perf_counter()
+    scored = 0
+    for lead in rules.iter_leads(conn, rules.LEAD_COLUMNS):
+        if rules.already_scored(conn, lead["id"]):
+            continue
+        rules.insert_score(conn, lead["id"], rules.rules_based_score(lead))
+        scored += 1
+    stats["writer_seconds"] = time.perf_counter() - start
+    stats["scored"] = scored
+    done.set()
+
+def run_reader(connection, done: threading.Event, latencies: list, errors: list):
+    while not done.is_set():
+        with connection() as conn:
+            start = time.perf_counter()
+            try:
+                conn.execute(TOP_SCORED_LEADS_QUERY, (rules.MODEL_VERSION, 20)).fetchall()
+                latencies.append(time.perf_counter() - start)
+            except sqlite3.OperationalError:
+                errors.append(time.perf_counter() - start)
+
+def run_mode(name: str, db_file: str, readers: int):
+    done = threading.Event()
+    stats, latencies, errors = {}, [], []
+
+    if name == "default":
+        writer_conn = sqlite3.connect(db_file, check_same_thread=False)
+        writer_conn.execute("PRAGMA journal_mode = DELETE")
+        local = threading.local()
+
+        @contextmanager
+        def connection():
+            if not hasattr(local, "conn"):
+                local.conn = sqlite3.connect(db_file)
+            yield local.conn
+    else:
+        writer_conn = connect(db_file, check_same_thread=False)
+        connection = ConnectionPool(db_file, size=readers).connection
+
+    # Make sure the table exists before readers start querying it
+    rules.ensure_tables(writer_conn)
+
+    threads = [threading.Thread(target=run_reader, args=(connection, done, latencies, errors)) for _ in range(readers)]
+    writer = threading.Thread(target=run_writer, args=(writer_conn, done, stats))
+    for t in threads + [writer]:
+        t.start()
+    for t in threads + [writer]:
+        t.join()
+    writer_conn.close()
+
+    latencies.sort()
+    p = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000 if latencies else float("nan")
+    print(
+        f"{name:<10}{stats['scored']:>9}{stats['scored'] / stats['writer_seconds']:>12.0f}"
+        f"{len(latencies):>10}{len(errors):>9}"
+        f"{statistics.median(latencies) * 1000 if latencies else float('nan'):>10.2f}{p(0.99):>10.2f}"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    template = os.path.join(workdir, "template.db")
+    build_database(template, args.rows)
+
+    print(f"{'mode':<10}{'scored':>9}{'writes/s':>12}{'reads':>10}{'locked':>9}{'p50 ms':>10}{'p99 ms':>10}")
+    for name in ("default", "tuned"):
+        db_file = os.path.join(workdir, f"{name}.db")
+        shutil.copy(template, db_file)
+        run_mode(name, db_file, args.readers)
+
+    shutil.rmtree(workdir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Export throughput and peak RSS: pandas round-trip vs streaming Arrow export.
+
+    python -m benchmarks.bench_export [--rows 1000000] [--db PATH]
+
+Reuses the synthetic leads database from bench_lead_loader (built if
+missing) and seeds a score history the first time: --history rules_v1
+rescoring passes over 80% of leads plus one ml_v1 pass, so the export
+resolves the latest score per lead out of several. Each exporter runs in a
+fresh subprocess writing to its own temp directory; the read rows load one
+province and three columns back.
+"""
+import argparse
+import os
+import resource
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+import psutil
+
+from benchmarks.bench_lead_loader import DEFAULT_DB, PROJECT_ROOT, build_database
+
+def seed_scores(db: str, history: int):
+    from core.lead_export.lead_export import ensure_score_index
+
+    # Same table and index the scoring jobs create
+    ensure_score_index(db)
+    conn = sqlite3.connect(db)
+    if conn.execute("SELECT COUNT(*) FROM lead_scores").fetchone()[0]:
+        conn.close()
+        return
+
+    passes = [("rules_v1", f"2025-01-{i + 1:02d}") for i in range(history)] + [("ml_v1", "2025-02-01")]
+    for model_version, created_at in passes:
+        print(f"Seeding {model_version} scores from {created_at} ...")
+        conn.execute("""
+            INSERT INTO lead_scores (leads_id, score, top_features, explanation, created_at, model_version)
+            SELECT id, ABS(RANDOM()) % 101, '["Has valid email address.", "Has a website."]',
+                   'Rules applied', ?, ?
+            FROM leads WHERE id % 5 != 0
+        """, (created_at, model_version))
+        conn.commit()
+    conn.close()
+
+def pandas_export(db: str, out_dir: str):
+    import pandas as pd
+    from config.queries import LEADS_WITH_CURRENT_SCORES_QUERY
+
+    conn = sqlite3.connect(db)
+    df = pd.read_sql_query(LEADS_WITH_CURRENT_SCORES_QUERY, conn, params=("rules_v1",))
+    conn.close()
+    df.to_parquet(out_dir, partition_cols=["province"], index=False)
+    return len(df)
+
+def arrow_export(db: str, out_dir: str):
+    from core.lead_export.lead_export import export_parquet
+    return export_parquet(db, out_dir)["rows"]
+
+def pandas_read(db: str, out_dir: str):
+    import pandas as pd
+    df = pd.read_parquet(out_dir)
+    return len(df[df["province"] == "ON"][["id", "clinic_name", "score"]])
+
+def arrow_read(db: str, out_dir: str):
+    from core.lead_export.lead_export import read_export
+    return read_export(out_dir, province="ON", columns=["id", "clinic_name", "score"]).num_rows
+
+MODES = {
+    "export (pandas read_sql)": pandas_export,
+    "export (arrow stream)": arrow_export,
+    "read all (pandas)": pandas_read,
+    "read ON/3 cols (arrow)": arrow_read,
+}
+
+def run_child(name: str, db: str, out_dir: str):
+    import pandas  # noqa: F401  imported up front so it is part of the baseline
+    import pyarrow.dataset  # noqa: F401
+    import core.lead_export.lead_export  # noqa: F401
+
+    before = psutil.Process().memory_info().rss
+    start = time.perf_counter()
+    rows = MODES[name](db, out_dir)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    print(f"{before} {peak} {elapsed} {rows}")
+
+def child(name: str, db: str, out_dir: str):
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_export", "--db", db, "--out", out_dir, "--child", name],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    ).stdout.split()
+    return int(out[0]), int(out[1]), float(out[2]), int(out[3])
+
+def dir_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--db", default=DEFAULT_DB)
+    parser.add_argument("--history", type=int, default=3, help="rules_v1 scoring passes to seed")
+    parser.add_argument("--out", help=argparse.SUPPRESS)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.db, args.out)
+        return
+
+    if not os.path.exists(args.db):
+        print(f"Building {args.rows:,} leads in {args.db} ...")
+        build_database(args.db, args.rows)
+
+    seed_scores(args.db, args.history)
+
+    workdir = tempfile.mkdtemp()
+    print(f"{'mode':<26}{'rows':>10}{'peak RSS':>12}{'delta':>12}{'time':>9}{'rows/s':>12}{'on disk':>10}")
+    for engine in ("pandas", "arrow"):
+        out_dir = os.path.join(workdir, engine)
+        for name in MODES:
+            if engine not in name:
+                continue
+            before, peak, elapsed, rows = child(name, args.db, out_dir)
+            print(
+                f"{name:<26}{rows:>10}{peak / 2**20:>10.0f}MB{(peak - before) / 2**20:>10.0f}MB"
+                f"{elapsed:>8.2f}s{rows / elapsed:>12,.0f}{dir_size(out_dir) / 2**20:>8.0f}MB"
+            )
+
+    shutil.rmtree(workdir)
+
+if __name__ == "__main__":
+    main()
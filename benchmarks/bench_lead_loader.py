@@ -0,0 +1,128 @@
+"""
+Peak RSS of the legacy lead loaders vs the lean loader.
+
+    python -m benchmarks.bench_lead_loader [--rows 1000000] [--db PATH]
+
+Builds a synthetic leads database (reused if it already exists), then runs
+each loader in a fresh subprocess and reports RSS before loading and the
+process peak RSS after.
+"""
+import argparse
+import os
+import random
+import resource
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+import psutil
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_DB = os.path.join(tempfile.gettempdir(), "lyyvora_bench_leads.db")
+
+SUB_TYPES = [
+    "Dental clinic", "Physiotherapy", "Medical spa", "Chiropractor",
+    "Dental clinic, Orthodontist", "Massage therapist", "Skin care clinic, Medical spa"
+]
+PROVINCES = ["ON", "QC", "BC", "AB", "MB", "SK", "NS", "NB", "PE", "NL"]
+
+def build_database(path: str, rows: int):
+    from config.queries import LEADS_TABLE_SCHEMA
+
+    rng = random.Random(42)
+    conn = sqlite3.connect(path)
+    conn.execute(LEADS_TABLE_SCHEMA)
+
+    def gen():
+        for i in range(rows):
+            yield (
+                f"Clinic {i}", "Health", rng.choice(SUB_TYPES), f"City {i % 500}",
+                rng.choice(PROVINCES),
+                f"{2000000000 + i}" if rng.random() > 0.2 else None,
+                f"lead{i}@example.com",
+                f"https://clinic{i}.example.com" if rng.random() > 0.4 else None,
+                "We provide compassionate, evidence-based care for the whole family. " * 4,
+                rng.randint(0, 300), round(rng.uniform(2.5, 5.0), 1)
+            )
+
+    conn.executemany("""
+        INSERT INTO leads (clinic_name, clinic_main_type, clinic_sub_type, city, province,
+                           phone, email, website_url, website_desc, total_reviews, average_rating)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, gen())
+    conn.commit()
+    conn.close()
+
+def legacy_ml(conn):
+    import pandas as pd
+    conn.row_factory = sqlite3.Row
+    return pd.read_sql_query("SELECT * FROM leads", conn)
+
+def lean_ml(conn):
+    from core.lead_scoring_model.ml_baseline import fetch_leads
+    return fetch_leads(conn)
+
+def legacy_rules(conn):
+    conn.row_factory = sqlite3.Row
+    return [dict(row) for row in conn.execute("SELECT * FROM leads").fetchall()]
+
+def lean_rules(conn):
+    from core.lead_scoring_model.rules_based_baseline import fetch_leads
+    count = 0
+    for _ in fetch_leads(conn):
+        count += 1
+    return count
+
+LOADERS = {
+    "ml (legacy SELECT *)": legacy_ml,
+    "ml (lean frame)": lean_ml,
+    "rules (legacy Row->dict)": legacy_rules,
+    "rules (lean stream)": lean_rules,
+}
+
+def run_child(name: str, db: str):
+    import pandas  # noqa: F401  imported up front so it is part of the baseline
+    import core.lead_scoring_model.ml_baseline  # noqa: F401
+    import core.lead_scoring_model.rules_based_baseline  # noqa: F401
+
+    conn = sqlite3.connect(db)
+    before = psutil.Process().memory_info().rss
+    start = time.perf_counter()
+    result = LOADERS[name](conn)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    conn.close()
+    del result
+    print(f"{before} {peak} {elapsed}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--db", default=DEFAULT_DB)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.db)
+        return
+
+    if not os.path.exists(args.db):
+        print(f"Building {args.rows:,} leads in {args.db} ...")
+        build_database(args.db, args.rows)
+
+    print(f"{'loader':<28}{'RSS before':>12}{'peak RSS':>12}{'delta':>12}{'time':>9}")
+    for name in LOADERS:
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_lead_loader", "--db", args.db, "--child", name],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.split()
+        before, peak, elapsed = int(out[0]), int(out[1]), float(out[2])
+        print(
+            f"{name:<28}{before / 2**20:>10.0f}MB{peak / 2**20:>10.0f}MB"
+            f"{(peak - before) / 2**20:>10.0f}MB{elapsed:>8.2f}s"
+        )
+
+if __name__ == "__main__":
+    main()
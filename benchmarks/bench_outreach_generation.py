@@ -0,0 +1,51 @@
+"""
+Outreach generation throughput against the offline fake LLM backend.
+
+    python -m benchmarks.bench_outreach_generation [--clinics 200] [--latency 0.05] [--tps 2000]
+
+Compares one request per email with batched generation at a few batch
+sizes. No network access is needed.
+"""
+import argparse
+import time
+
+from core.outreach_generator.llm_backends import FakeBackend
+from core.outreach_generator.outreach_generator import generate_email, generate_emails
+
+def make_clinics(n: int):
+    return [
+        {
+            "clinic_name": f"Clinic {i}",
+            "clinic_sub_type": "Dental clinic",
+            "city": "Toronto",
+            "website_desc": "Family dentistry, implants and cosmetic care. " * (i % 20),
+        }
+        for i in range(n)
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clinics", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated seconds per request")
+    parser.add_argument("--tps", type=float, default=2000, help="Simulated output tokens per second")
+    args = parser.parse_args()
+
+    clinics = make_clinics(args.clinics)
+    print(f"{'mode':<24}{'requests':>10}{'seconds':>10}{'emails/s':>10}")
+
+    backend = FakeBackend(latency=args.latency, tokens_per_second=args.tps)
+    start = time.perf_counter()
+    for clinic in clinics:
+        generate_email(clinic, backend=backend)
+    elapsed = time.perf_counter() - start
+    print(f"{'sequential':<24}{backend.requests:>10}{elapsed:>10.2f}{len(clinics) / elapsed:>10.1f}")
+
+    for batch_size in (4, 8, 16):
+        backend = FakeBackend(latency=args.latency, tokens_per_second=args.tps, max_batch_size=batch_size)
+        start = time.perf_counter()
+        generate_emails(clinics, backend=backend, batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+        print(f"{f'batched x{batch_size}':<24}{backend.requests:>10}{elapsed:>10.2f}{len(clinics) / elapsed:>10.1f}")
+
+if __name__ == "__main__":
+    main()
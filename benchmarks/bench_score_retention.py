@@ -0,0 +1,96 @@
+"""
+lead_scores size and query latency before and after score compaction.
+
+    python -m benchmarks.bench_score_retention [--leads 50000] [--runs 10]
+
+Simulates `--runs` scoring runs of two model versions over `--leads` leads,
+then compacts with each archive target and re-measures. Sizes are taken
+after VACUUM so freed pages are not counted.
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+
+from benchmarks.bench_lead_loader import build_database
+from config.database import connect
+from config.queries import (
+    INSERT_LEAD_SCORE,
+    LEAD_SCORES_BY_LEAD_QUERY,
+    TOP_CLINICS_QUERY,
+    TOP_SCORED_LEADS_QUERY,
+)
+from core.lead_scoring_model.score_retention import compact_scores, ensure_tables
+
+QUERIES = {
+    "outreach top clinics": (TOP_CLINICS_QUERY, lambda n: (5,)),
+    "API /leads": (TOP_SCORED_LEADS_QUERY, lambda n: ("rules_v1", 20)),
+    "API /leads/{id} scores": (LEAD_SCORES_BY_LEAD_QUERY, lambda n: (random.randint(1, n),)),
+}
+
+def build_scores(db_file: str, leads: int, runs: int):
+    build_database(db_file, leads)
+    conn = connect(db_file)
+    ensure_tables(conn)
+    rng = random.Random(7)
+    for run in range(runs):
+        for model_version in ("rules_v1", "ml_v1"):
+            conn.executemany(INSERT_LEAD_SCORE, (
+                (leads_id, rng.randint(0, 100), '["Has valid email address."]',
+                 "Rules applied: Has valid email address.", f"2025-01-{run + 1:02d}", model_version)
+                for leads_id in range(1, leads + 1)
+            ))
+    conn.commit()
+    conn.close()
+
+def measure(db_file: str, leads: int, repeat: int = 5):
+    conn = connect(db_file)
+    conn.execute("VACUUM")
+    stats = {
+        "rows": conn.execute("SELECT COUNT(*) FROM lead_scores").fetchone()[0],
+        "mb": os.path.getsize(db_file) / 2**20,
+    }
+    for name, (query, params) in QUERIES.items():
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(query, params(leads)).fetchall()
+            timings.append(time.perf_counter() - start)
+        stats[name] = statistics.median(timings) * 1000
+    conn.close()
+    return stats
+
+def report(label: str, stats: dict):
+    print(f"{label:<18}{stats['rows']:>12,}{stats['mb']:>10.1f}" + "".join(f"{stats[n]:>26.2f}" for n in QUERIES))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leads", type=int, default=50_000)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    template = os.path.join(workdir, "template.db")
+    build_scores(template, args.leads, args.runs)
+
+    print(f"{'state':<18}{'score rows':>12}{'db MB':>10}" + "".join(f"{n + ' ms':>26}" for n in QUERIES))
+    report("before", measure(template, args.leads))
+
+    for target in ("table", "parquet"):
+        db_file = os.path.join(workdir, f"{target}.db")
+        shutil.copy(template, db_file)
+        conn = connect(db_file)
+        start = time.perf_counter()
+        result = compact_scores(conn, target=target, archive_dir=os.path.join(workdir, "archive"))
+        elapsed = time.perf_counter() - start
+        conn.close()
+        report(f"after ({target})", measure(db_file, args.leads))
+        print(f"{'':<18}archived {result['archived']:,} rows in {result['batches']} batches, {elapsed:.1f}s")
+
+    shutil.rmtree(workdir)
+
+if __name__ == "__main__":
+    main()
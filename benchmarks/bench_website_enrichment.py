@@ -0,0 +1,86 @@
+"""
+Website enrichment throughput against a local HTTP stand-in.
+
+    python -m benchmarks.bench_website_enrichment [--sites 2000] [--hosts 200] [--latency 0.1]
+
+Serves a clinic page from one local server reachable as many loopback
+hosts (127.0.0.x), so per-host politeness applies as in production. Runs
+a cold pass (200s) and a warm pass (conditional GET, 304s) and reports
+sites per hour.
+"""
+import argparse
+import asyncio
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from core.website_enrichment.website_enrichment import HostLimiter, enrich_sites
+
+PAGE = (
+    "<html><body><h1>Clinic</h1><p>Financing and payment plans available.</p>"
+    "<p>Dr. Jane Smith, Dr. Omar Khan. 100 King St W, Toronto ON M5X 1A9</p>"
+    "<a href='/team'>Team</a><a href='/blog'>Blog</a><time datetime='2024-05-02'>May</time>"
+    + "<p>We provide compassionate, evidence-based care for the whole family.</p>" * 200
+    + "</body></html>"
+).encode("utf-8")
+
+def make_handler(latency: float):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(latency)
+            etag = f'"{self.path}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(PAGE)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(PAGE)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sites", type=int, default=2000)
+    parser.add_argument("--hosts", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.1, help="Simulated server response time in seconds")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--host-delay", type=float, default=1.0)
+    args = parser.parse_args()
+
+    ThreadingHTTPServer.daemon_threads = True
+    httpd = ThreadingHTTPServer(("0.0.0.0", 0), make_handler(args.latency))
+    port = httpd.server_address[1]
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    leads = [
+        (i, f"http://127.0.0.{2 + i % args.hosts}:{port}/clinic/{i}")
+        for i in range(args.sites)
+    ]
+    cache_dir = tempfile.mkdtemp()
+
+    print(f"{'pass':<8}{'sites':>8}{'seconds':>10}{'sites/hour':>14}")
+    for name in ("cold", "warm"):
+        limiter = HostLimiter(delay=args.host_delay)
+        start = time.perf_counter()
+        results = asyncio.run(enrich_sites(leads, concurrency=args.concurrency, limiter=limiter, cache_dir=cache_dir))
+        elapsed = time.perf_counter() - start
+        ok = sum(1 for r in results if r["fetched"])
+        print(f"{name:<8}{ok:>8}{elapsed:>10.1f}{ok / elapsed * 3600:>14,.0f}")
+
+    httpd.shutdown()
+    shutil.rmtree(cache_dir)
+
+if __name__ == "__main__":
+    main()
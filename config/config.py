@@ -0,0 +1,30 @@
+import os
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DATASET_DIR = os.path.join(PROJECT_ROOT, "datasets", "real_set_v1")
+DB_FILE = os.environ.get("LYYVORA_DB_FILE", os.path.join(DATASET_DIR, "records.db"))
+LOG_DIR = os.path.join(PROJECT_ROOT, "logs")
+
+# --------------------------------
+# SQLite tuning
+# --------------------------------
+# How long a connection waits on a lock before raising "database is locked"
+SQLITE_BUSY_TIMEOUT_MS = 5000
+# Bytes of the database file memory-mapped for reads
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+# Page cache per connection; negative values are KiB (here 64 MiB)
+SQLITE_CACHE_SIZE = -64000
+# Read-only connections kept open for the API
+SQLITE_POOL_SIZE = 8
+
+# --------------------------------
+# Website enrichment
+# --------------------------------
+# Conditional-GET cache of fetched lead websites
+WEB_CACHE_DIR = os.path.join(DATASET_DIR, "web_cache")
+
+# --------------------------------
+# Exports
+# --------------------------------
+# Province-partitioned Parquet export of leads + current scores
+EXPORT_DIR = os.path.join(DATASET_DIR, "exports", "leads")
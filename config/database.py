@@ -0,0 +1,140 @@
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from typing import List, Set
+
+from config.config import (
+    DB_FILE,
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_CACHE_SIZE,
+    SQLITE_MMAP_SIZE,
+    SQLITE_POOL_SIZE,
+)
+
+def _apply_pragmas(conn, read_only: bool):
+    conn.execute(f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}")
+    conn.execute(f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE}")
+    conn.execute(f"PRAGMA cache_size = {SQLITE_CACHE_SIZE}")
+
+    if not read_only:
+        # WAL lets readers keep reading while a single writer commits;
+        # NORMAL sync is durable across app crashes in WAL mode
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+
+def connect(db_file: str = DB_FILE, read_only: bool = False, check_same_thread: bool = True) -> sqlite3.Connection:
+    """
+    Open a tuned SQLite connection.
+
+    Writers (pipeline and scoring jobs) switch the database to WAL, which
+    persists in the file. Read-only connections open the file with
+    mode=ro so they can never take the write lock.
+    """
+    if read_only:
+        conn = sqlite3.connect(
+            f"file:{db_file}?mode=ro", uri=True,
+            timeout=SQLITE_BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=check_same_thread
+        )
+    else:
+        conn = sqlite3.connect(
+            db_file,
+            timeout=SQLITE_BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=check_same_thread
+        )
+
+    _apply_pragmas(conn, read_only)
+    return conn
+
+class ConnectionPool:
+    """
+    Fixed-size pool of tuned connections shared across threads.
+
+    Connections are opened lazily up to `size` and handed out one per
+    caller through `connection()`; a caller blocks when all are in use.
+    """
+
+    def __init__(self, db_file: str = DB_FILE, size: int = SQLITE_POOL_SIZE, read_only: bool = True):
+        self.db_file = db_file
+        self.size = size
+        self.read_only = read_only
+        self._idle: List[sqlite3.Connection] = []
+        self._in_use: Set[sqlite3.Connection] = set()
+        # Checked out when close() ran; closed instead of reused on return
+        self._stale: Set[sqlite3.Connection] = set()
+        self._opened = 0
+        self._cond = threading.Condition()
+
+    def _acquire(self) -> sqlite3.Connection:
+        with self._cond:
+            while not self._idle and self._opened >= self.size:
+                self._cond.wait()
+            if self._idle:
+                conn = self._idle.pop()
+                self._in_use.add(conn)
+                return conn
+            self._opened += 1
+
+        try:
+            conn = connect(self.db_file, read_only=self.read_only, check_same_thread=False)
+        except Exception:
+            with self._cond:
+                self._opened -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self._in_use.add(conn)
+        return conn
+
+    def _release(self, conn: sqlite3.Connection):
+        with self._cond:
+            self._in_use.discard(conn)
+            stale = conn in self._stale
+            if stale:
+                self._stale.discard(conn)
+                self._opened -= 1
+            else:
+                self._idle.append(conn)
+            self._cond.notify()
+        if stale:
+            conn.close()
+
+    @contextmanager
+    def connection(self):
+        conn = self._acquire()
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._release(conn)
+
+    def close(self):
+        """
+        Close idle connections now and checked-out ones when they are
+        returned; they keep counting towards `size` until then.
+        """
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._stale.update(self._in_use)
+            self._opened -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            conn.close()
+        logging.info(f"Closed connection pool for {self.db_file}")
+
+_read_pool = None
+_read_pool_lock = threading.Lock()
+
+def get_read_pool() -> ConnectionPool:
+    """
+    Process-wide read-only pool on DB_FILE, created on first use.
+    """
+    global _read_pool
+    with _read_pool_lock:
+        if _read_pool is None:
+            _read_pool = ConnectionPool(DB_FILE, read_only=True)
+    return _read_pool
@@ -0,0 +1,226 @@
+# --------------------------------
+# Schemas
+# --------------------------------
+LEADS_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS leads (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    clinic_name TEXT NOT NULL,
+    clinic_main_type TEXT,
+    clinic_sub_type TEXT,
+    city TEXT,
+    province TEXT,
+    phone TEXT UNIQUE,
+    email TEXT UNIQUE NOT NULL,
+    website_url TEXT,
+    website_desc TEXT,
+    total_reviews INTEGER,
+    average_rating REAL
+);
+"""
+
+LEAD_SCORES_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS lead_scores (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    leads_id INTEGER NOT NULL,
+    score REAL,
+    top_features TEXT,
+    explanation TEXT,
+    created_at DATETIME,
+    model_version TEXT,
+    FOREIGN KEY (leads_id) REFERENCES leads(id)
+);
+"""
+
+# Backs already-scored checks and per-lead score lookups
+LEAD_SCORES_INDEX_SCHEMA = """
+CREATE INDEX IF NOT EXISTS idx_lead_scores_lead_model
+ON lead_scores (leads_id, model_version);
+"""
+
+# Superseded lead_scores rows, moved out by the retention job (ids are kept)
+LEAD_SCORES_ARCHIVE_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS lead_scores_archive (
+    id INTEGER PRIMARY KEY,
+    leads_id INTEGER NOT NULL,
+    score REAL,
+    top_features TEXT,
+    explanation TEXT,
+    created_at DATETIME,
+    model_version TEXT,
+    archived_at DATETIME
+);
+"""
+
+# Key/value progress markers for maintenance jobs
+MAINTENANCE_STATE_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS maintenance_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+OUTREACH_MESSAGES_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outreach_messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    leads_id INTEGER NOT NULL,
+    channel TEXT,
+    variant TEXT,
+    template_version TEXT,
+    subject_line TEXT,
+    message_body TEXT,
+    created_at DATETIME,
+    FOREIGN KEY (leads_id) REFERENCES leads(id)
+);
+"""
+
+LEAD_WEBSITE_FEATURES_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS lead_website_features (
+    leads_id INTEGER PRIMARY KEY,
+    website_url TEXT,
+    http_status INTEGER,
+    from_cache INTEGER,
+    financing_keyword_count INTEGER,
+    financing_keywords TEXT,
+    practitioner_count INTEGER,
+    location_count INTEGER,
+    has_team_page INTEGER,
+    has_blog INTEGER,
+    latest_post_year INTEGER,
+    word_count INTEGER,
+    fetched_at DATETIME,
+    FOREIGN KEY (leads_id) REFERENCES leads(id)
+);
+"""
+
+# --------------------------------
+# Lead scores
+# --------------------------------
+INSERT_LEAD_SCORE = """
+INSERT INTO lead_scores (
+    leads_id,
+    score,
+    top_features,
+    explanation,
+    created_at,
+    model_version
+) VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+ALREADY_SCORED_QUERY = """
+SELECT 1 FROM lead_scores
+WHERE leads_id = ? AND model_version = ?
+LIMIT 1
+"""
+
+# Scores with a newer row for the same (lead, model_version), limited to
+# groups that received a score after the given id
+SUPERSEDED_SCORES_QUERY = """
+SELECT s.id
+FROM lead_scores s
+JOIN (
+    SELECT leads_id, model_version, MAX(id) AS latest_id
+    FROM lead_scores
+    WHERE (leads_id, model_version) IN (
+        SELECT leads_id, model_version FROM lead_scores WHERE id > ?
+    )
+    GROUP BY leads_id, model_version
+) g ON s.leads_id = g.leads_id AND s.model_version = g.model_version
+WHERE s.id < g.latest_id
+ORDER BY s.id
+"""
+
+TOP_SCORED_LEADS_QUERY = """
+SELECT l.id, l.clinic_name, l.clinic_sub_type, l.city, l.province,
+       s.score, s.top_features, s.explanation, s.model_version, s.created_at
+FROM lead_scores s
+JOIN leads l ON l.id = s.leads_id
+WHERE s.model_version = ?
+  AND s.id = (
+    SELECT MAX(id) FROM lead_scores
+    WHERE leads_id = s.leads_id AND model_version = s.model_version
+  )
+ORDER BY s.score DESC
+LIMIT ?
+"""
+
+LEAD_BY_ID_QUERY = """
+SELECT id, clinic_name, clinic_main_type, clinic_sub_type, city, province,
+       phone, email, website_url, website_desc, total_reviews, average_rating
+FROM leads
+WHERE id = ?
+"""
+
+LEAD_SCORES_BY_LEAD_QUERY = """
+SELECT score, top_features, explanation, model_version, created_at
+FROM lead_scores
+WHERE leads_id = ?
+ORDER BY id DESC
+"""
+
+# --------------------------------
+# Outreach
+# --------------------------------
+TOP_CLINICS_QUERY = """
+SELECT l.id AS leads_id, l.clinic_name, l.clinic_sub_type, l.city, l.website_desc
+FROM leads l
+LEFT JOIN lead_scores s
+ON l.id = s.leads_id
+ORDER BY s.score DESC
+LIMIT ?;
+"""
+
+INSERT_OUTREACH_MESSAGE = """
+INSERT INTO outreach_messages (
+    leads_id,
+    channel,
+    variant,
+    template_version,
+    subject_line,
+    message_body,
+    created_at
+) VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# --------------------------------
+# Website enrichment
+# --------------------------------
+LEADS_WITH_WEBSITE_QUERY = """
+SELECT id, website_url
+FROM leads
+WHERE website_url IS NOT NULL
+ORDER BY id
+"""
+
+UPSERT_LEAD_WEBSITE_FEATURES = """
+INSERT OR REPLACE INTO lead_website_features (
+    leads_id,
+    website_url,
+    http_status,
+    from_cache,
+    financing_keyword_count,
+    financing_keywords,
+    practitioner_count,
+    location_count,
+    has_team_page,
+    has_blog,
+    latest_post_year,
+    word_count,
+    fetched_at
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# --------------------------------
+# Exports
+# --------------------------------
+# Every lead with its most recent score for one model version (NULL if unscored)
+LEADS_WITH_CURRENT_SCORES_QUERY = """
+SELECT l.id, l.clinic_name, l.clinic_main_type, l.clinic_sub_type, l.city, l.province,
+       l.phone, l.email, l.website_url, l.website_desc, l.total_reviews, l.average_rating,
+       s.score, s.top_features, s.model_version, s.created_at AS scored_at
+FROM leads l
+LEFT JOIN lead_scores s ON s.id = (
+    SELECT MAX(id) FROM lead_scores
+    WHERE leads_id = l.id AND model_version = ?
+)
+ORDER BY l.province, l.id
+"""
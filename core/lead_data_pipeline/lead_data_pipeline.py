@@ -1,14 +1,21 @@
+import argparse
+import cProfile
 import pandas as pd
-import sqlite3
 import logging
+import pstats
 import re
 import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
-INPUT_FILE = os.path.join(PROJECT_ROOT, "datasets", "real_set_v1", "records.csv")
-DB_FILE = os.path.join(PROJECT_ROOT, "datasets", "real_set_v1", "records.db")
-LOG_DIR = os.path.join(PROJECT_ROOT, "logs")
+import psutil
+
+from config.config import DATASET_DIR, DB_FILE, LOG_DIR
+from config.database import connect
+from config.queries import LEADS_TABLE_SCHEMA
+
+INPUT_FILE = os.path.join(DATASET_DIR, "records.csv")
 
 os.makedirs(LOG_DIR, exist_ok=True)
 logging.basicConfig(
@@ -18,22 +25,6 @@ logging.basicConfig(
 )
 
 EMAIL_REGEX = r"^[\w\.-]+@[\w\.-]+\.\w+$"
-LEADS_TABLE_SCHEMA = """
-                   CREATE TABLE IF NOT EXISTS leads (
-                       id INTEGER PRIMARY KEY AUTOINCREMENT,
-                       clinic_name TEXT NOT NULL,
-                       clinic_main_type TEXT,
-                       clinic_sub_type TEXT,
-                       city TEXT,
-                       province TEXT,
-                       phone TEXT UNIQUE,
-                       email TEXT UNIQUE NOT NULL,
-                       website_url TEXT,
-                       website_desc TEXT,
-                       total_reviews INTEGER,
-                       average_rating REAL
-                   );
-                   """
 
 def get_primary_email(email1: str, email2: str):
     for email in [email1, email2]:
@@ -115,7 +106,7 @@ def normalize_province(p: str):
     return lookup.get(p, p)
 
 def save_to_sqlite(df: pd.DataFrame):
-    conn = sqlite3.connect(DB_FILE)
+    conn = connect(DB_FILE)
     cursor = conn.cursor()
     
     cursor.execute(LEADS_TABLE_SCHEMA)
@@ -125,92 +116,206 @@ def save_to_sqlite(df: pd.DataFrame):
     conn.close()
 
 
-def main():
-    logging.info("Pipeline started.")
-    print("Pipeline started.")
-    
-    # Load CSV
-    df = pd.read_csv(INPUT_FILE)
-    logging.info(f"Loaded {len(df)} rows from {INPUT_FILE}")
-    print(f"Loaded {len(df)} rows from {INPUT_FILE}")
-
-    # Map raw CSV columns to DB columns
-    logging.info("Renaming columns to match DB schema.")
-    df = df.rename(columns={
-        "business_name": "clinic_name",
-        "type": "clinic_main_type",
-        "sub_types": "clinic_sub_type",
-        "business_website": "website_url",
-        "state": "province",
-        "business_phone": "phone"
-    })
-
-    # Clean & map
-    logging.info("Cleaning text fields and normalizing data.")
+COLUMN_MAP = {
+    "business_name": "clinic_name",
+    "type": "clinic_main_type",
+    "sub_types": "clinic_sub_type",
+    "business_website": "website_url",
+    "state": "province",
+    "business_phone": "phone"
+}
+
+LEADS_COLUMNS = [
+    "clinic_name", "clinic_main_type", "clinic_sub_type",
+    "city", "province", "phone", "email",
+    "website_url", "website_desc", "total_reviews", "average_rating"
+]
+
+PROFILE_FILE = os.path.join(LOG_DIR, "lead_data_pipeline.prof")
+PROFILE_TOP_FUNCTIONS = 20
+
+# --------------------------------
+# Pipeline steps: DataFrame in, DataFrame out
+# --------------------------------
+def rename_columns(df: pd.DataFrame) -> pd.DataFrame:
+    return df.rename(columns=COLUMN_MAP)
+
+def clean_text_columns(df: pd.DataFrame) -> pd.DataFrame:
     for col in ["clinic_main_type", "clinic_sub_type", "city"]:
         df[col] = df[col].apply(clean_text)
-        logging.info(f"Cleaned column '{col}'")
-        
-    df["clinic_name"] = df["clinic_name"].apply(clean_clinic_name)
-    logging.info("Cleaned 'clinic_name' column.")
+    return df
 
+def clean_clinic_name_column(df: pd.DataFrame) -> pd.DataFrame:
+    df["clinic_name"] = df["clinic_name"].apply(clean_clinic_name)
+    return df
 
+def normalize_province_column(df: pd.DataFrame) -> pd.DataFrame:
     df["province"] = df["province"].apply(normalize_province)
-    logging.info("Normalized 'province' column.")
+    return df
 
+def clean_phone_column(df: pd.DataFrame) -> pd.DataFrame:
     df["phone"] = df["phone"].apply(clean_phone)
-    logging.info("Cleaned 'phone' column.")
+    return df
 
+def clean_website_column(df: pd.DataFrame) -> pd.DataFrame:
     df["website_url"] = df["website_url"].apply(clean_website)
-    logging.info("Cleaned 'website_url' column.")
+    return df
 
+def map_primary_email(df: pd.DataFrame) -> pd.DataFrame:
     df["email"] = df.apply(lambda row: get_primary_email(row.get("email_1"), row.get("email_2")), axis=1)
-    logging.info("Mapped primary email for each row.")
+    return df
 
+def convert_numeric_columns(df: pd.DataFrame) -> pd.DataFrame:
     df["total_reviews"] = pd.to_numeric(df["total_reviews"], errors="coerce")
     df["average_rating"] = pd.to_numeric(df["average_rating"], errors="coerce")
-    logging.info("Converted 'total_reviews' and 'average_rating' to numeric.")
-
-    # Deduplicate
-    before = len(df)
-    df = df.drop_duplicates(subset=["clinic_name", "city"], keep='first')
-    logging.info(f"Dropped {before - len(df)} duplicate rows based on ['clinic_name', 'city'].")
-
-    before = len(df)
-    df = df[df['phone'].isna() | ~df.duplicated(subset=['phone'], keep='first')]
-    logging.info(f"Dropped {before - len(df)} duplicate rows based on 'phone'.")
-
-    before = len(df)
-    df = df[df['email'].isna() | ~df.duplicated(subset=['email'], keep='first')]
-    logging.info(f"Dropped {before - len(df)} duplicate rows based on 'email'.")
-
-    # Drop missing essential fields
-    before = len(df)
-    df = df.dropna(subset=["clinic_name"])
-    logging.info(f"Dropped {before - len(df)} rows missing 'clinic_name'.")
-
-    before = len(df)
-    df = df.dropna(subset=["email"])
-    logging.info(f"Dropped {before - len(df)} rows missing 'email'.")
-
-    # Reorder for SQLite
-    df = df[[
-        "clinic_name", "clinic_main_type", "clinic_sub_type",
-        "city", "province", "phone", "email",
-        "website_url", "website_desc", "total_reviews", "average_rating"
-    ]]
-    logging.info("Reordered columns for SQLite.")
-
-    # Convert NaN to None for SQLite
-    df = df.where(pd.notnull(df), None)
-    logging.info("Converted NaN values to None for SQLite.")
-
-    # Save
+    return df
+
+def dedupe_name_city(df: pd.DataFrame) -> pd.DataFrame:
+    return df.drop_duplicates(subset=["clinic_name", "city"], keep='first')
+
+def dedupe_phone(df: pd.DataFrame) -> pd.DataFrame:
+    return df[df['phone'].isna() | ~df.duplicated(subset=['phone'], keep='first')]
+
+def dedupe_email(df: pd.DataFrame) -> pd.DataFrame:
+    return df[df['email'].isna() | ~df.duplicated(subset=['email'], keep='first')]
+
+def drop_missing_clinic_name(df: pd.DataFrame) -> pd.DataFrame:
+    return df.dropna(subset=["clinic_name"])
+
+def drop_missing_email(df: pd.DataFrame) -> pd.DataFrame:
+    return df.dropna(subset=["email"])
+
+def select_leads_columns(df: pd.DataFrame) -> pd.DataFrame:
+    # NaN to None for SQLite
+    df = df[LEADS_COLUMNS]
+    return df.where(pd.notnull(df), None)
+
+def save_leads(df: pd.DataFrame) -> pd.DataFrame:
     save_to_sqlite(df)
-    logging.info(f"Saved {len(df)} rows to SQLite.")
+    return df
+
+# (name, step, source columns, cleaned column). When sources are given, values
+# present in a source but missing from the cleaned column count as invalid.
+PIPELINE_STEPS = [
+    ("rename_columns", rename_columns, None, None),
+    ("clean_text", clean_text_columns, None, None),
+    ("clean_clinic_name", clean_clinic_name_column, ["clinic_name"], "clinic_name"),
+    ("normalize_province", normalize_province_column, None, None),
+    ("clean_phone", clean_phone_column, ["phone"], "phone"),
+    ("clean_website", clean_website_column, ["website_url"], "website_url"),
+    ("primary_email", map_primary_email, ["email_1", "email_2"], "email"),
+    ("convert_numeric", convert_numeric_columns, ["total_reviews", "average_rating"], None),
+    ("dedupe_name_city", dedupe_name_city, None, None),
+    ("dedupe_phone", dedupe_phone, None, None),
+    ("dedupe_email", dedupe_email, None, None),
+    ("drop_missing_clinic_name", drop_missing_clinic_name, None, None),
+    ("drop_missing_email", drop_missing_email, None, None),
+    ("select_columns", select_leads_columns, None, None),
+]
+
+def _count_invalid(before: pd.DataFrame, after: pd.DataFrame, sources: List[str], target: Optional[str]) -> int:
+    sources = [col for col in sources if col in before.columns]
+    if not sources:
+        return 0
+    if target is not None:
+        had_value = before[sources].notna().any(axis=1)
+        return int((had_value & after[target].isna()).sum())
+    # In-place conversion: compare each column with itself
+    return int(sum((before[col].notna() & after[col].isna()).sum() for col in sources))
+
+def run_step(df: Optional[pd.DataFrame], report: List[Dict[str, Any]], name: str, step: Callable, sources=None, target=None) -> pd.DataFrame:
+    """
+    Run one pipeline step and append its timings and row counts to `report`.
+    """
+    process = psutil.Process()
+    rows_in = 0 if df is None else len(df)
+    # Steps may modify columns in place, so keep what the invalid count needs
+    source_frame = df[[col for col in sources if col in df.columns]].copy() if sources and df is not None else None
+    rss_before = process.memory_info().rss
+
+    start = time.perf_counter()
+    out = step(df)
+    seconds = time.perf_counter() - start
+
+    entry = {
+        "step": name,
+        "seconds": seconds,
+        "rows_in": rows_in,
+        "rows_out": len(out),
+        "dropped": max(rows_in - len(out), 0),
+        "invalid": _count_invalid(source_frame, out, sources, target) if source_frame is not None else 0,
+        "rss_delta_mb": (process.memory_info().rss - rss_before) / 2**20,
+    }
+    report.append(entry)
+    logging.info(
+        f"Step {name}: {entry['rows_in']} -> {entry['rows_out']} rows "
+        f"(dropped={entry['dropped']}, invalid={entry['invalid']}) in {seconds:.3f}s, "
+        f"rss_delta={entry['rss_delta_mb']:+.1f}MB"
+    )
+    return out
+
+def run_pipeline(input_file: str = INPUT_FILE, dry_run: bool = False) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Load, clean and dedupe `input_file`, then save to SQLite unless `dry_run`.
+    Returns the cleaned leads and the per-step report.
+    """
+    report: List[Dict[str, Any]] = []
+
+    df = run_step(None, report, "load_csv", lambda _: pd.read_csv(input_file))
+    logging.info(f"Loaded {len(df)} rows from {input_file}")
+    print(f"Loaded {len(df)} rows from {input_file}")
+
+    for name, step, sources, target in PIPELINE_STEPS:
+        df = run_step(df, report, name, step, sources, target)
+
+    if dry_run:
+        logging.info(f"Dry run: skipped saving {len(df)} rows to SQLite.")
+    else:
+        df = run_step(df, report, "save_to_sqlite", save_leads)
+        logging.info(f"Saved {len(df)} rows to SQLite.")
+
+    return df, report
+
+def format_report(report: List[Dict[str, Any]]) -> str:
+    lines = [f"{'step':<26}{'seconds':>9}{'rows in':>10}{'rows out':>10}{'dropped':>9}{'invalid':>9}{'rss MB':>9}"]
+    for entry in report:
+        lines.append(
+            f"{entry['step']:<26}{entry['seconds']:>9.3f}{entry['rows_in']:>10}{entry['rows_out']:>10}"
+            f"{entry['dropped']:>9}{entry['invalid']:>9}{entry['rss_delta_mb']:>+9.1f}"
+        )
+    lines.append(f"{'total':<26}{sum(entry['seconds'] for entry in report):>9.3f}")
+    return "\n".join(lines)
+
+def main(input_file: str = INPUT_FILE, dry_run: bool = False, profile: bool = False, profile_file: str = PROFILE_FILE):
+    # Profiling is for tuning new sources, so it never writes
+    dry_run = dry_run or profile
+    logging.info(f"Pipeline started.{' (dry run)' if dry_run else ''}")
+    print("Pipeline started.")
+
+    if profile:
+        profiler = cProfile.Profile()
+        _, report = profiler.runcall(run_pipeline, input_file, dry_run)
+        profiler.dump_stats(profile_file)
+    else:
+        _, report = run_pipeline(input_file, dry_run)
+
+    if dry_run:
+        print(format_report(report))
+    if profile:
+        stats = pstats.Stats(profile_file)
+        stats.sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+        print(f"Full profile written to {profile_file} (load with pstats.Stats)")
 
     logging.info("Pipeline completed successfully.")
     print("Pipeline completed successfully.")
+    return report
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Clean and dedupe raw lead CSVs into the leads table.")
+    parser.add_argument("--input", default=INPUT_FILE)
+    parser.add_argument("--dry-run", action="store_true", help="run every step but do not write to SQLite")
+    parser.add_argument("--profile", action="store_true", help="dry run under cProfile and print the per-step report")
+    parser.add_argument("--profile-file", default=PROFILE_FILE)
+    args = parser.parse_args()
+
+    main(args.input, dry_run=args.dry_run, profile=args.profile, profile_file=args.profile_file)
@@ -0,0 +1,222 @@
+import argparse
+import io
+import logging
+import os
+import shutil
+import time
+from itertools import groupby
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from config.config import DB_FILE, EXPORT_DIR, LOG_DIR
+from config.database import connect
+from config.queries import LEAD_SCORES_INDEX_SCHEMA, LEAD_SCORES_TABLE_SCHEMA, LEADS_WITH_CURRENT_SCORES_QUERY
+
+os.makedirs(LOG_DIR, exist_ok=True)
+logging.basicConfig(
+    filename=os.path.join(LOG_DIR, "lead_export.log"),
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+DEFAULT_MODEL_VERSION = "rules_v1"
+BATCH_SIZE = 10_000
+MAX_ROWS_PER_FILE = 1_000_000
+
+EXPORT_SCHEMA = pa.schema([
+    ("id", pa.int64()),
+    ("clinic_name", pa.string()),
+    ("clinic_main_type", pa.string()),
+    ("clinic_sub_type", pa.string()),
+    ("city", pa.string()),
+    ("province", pa.string()),
+    ("phone", pa.string()),
+    ("email", pa.string()),
+    ("website_url", pa.string()),
+    ("website_desc", pa.string()),
+    ("total_reviews", pa.float64()),
+    ("average_rating", pa.float64()),
+    ("score", pa.float64()),
+    ("top_features", pa.string()),
+    ("model_version", pa.string()),
+    ("scored_at", pa.string()),
+])
+
+PARTITIONING = ds.partitioning(pa.schema([("province", pa.string())]), flavor="hive")
+HIVE_NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+# Province lives in the directory name, not in the files
+FILE_SCHEMA = EXPORT_SCHEMA.remove(EXPORT_SCHEMA.get_field_index("province"))
+
+def iter_record_batches(conn, model_version: str = DEFAULT_MODEL_VERSION, batch_size: int = BATCH_SIZE) -> Iterator[pa.RecordBatch]:
+    """
+    Stream leads joined with their current score as Arrow record batches.
+    Only one batch of rows is held in Python at a time.
+
+    The per-lead latest-score lookup relies on idx_lead_scores_lead_model;
+    without it every lead scans lead_scores. `ensure_score_index` creates it.
+    """
+    cursor = conn.execute(LEADS_WITH_CURRENT_SCORES_QUERY, (model_version,))
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+
+        columns = list(zip(*rows))
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, EXPORT_SCHEMA)],
+            schema=EXPORT_SCHEMA
+        )
+
+def iter_ipc_stream(conn, model_version: str = DEFAULT_MODEL_VERSION, batch_size: int = BATCH_SIZE) -> Iterator[bytes]:
+    """
+    Same rows as `iter_record_batches`, encoded as an Arrow IPC stream
+    one chunk per batch, for sending over HTTP.
+    """
+    sink = io.BytesIO()
+    with ipc.new_stream(sink, EXPORT_SCHEMA) as writer:
+        for batch in iter_record_batches(conn, model_version, batch_size):
+            writer.write_batch(batch)
+            yield sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+    # End-of-stream marker written on close
+    yield sink.getvalue()
+
+def ensure_score_index(db_file: str = DB_FILE):
+    """
+    Create lead_scores and its (leads_id, model_version) index if missing.
+    Exports read through read-only connections, so this needs its own writer.
+    """
+    conn = connect(db_file)
+    try:
+        conn.execute(LEAD_SCORES_TABLE_SCHEMA)
+        conn.execute(LEAD_SCORES_INDEX_SCHEMA)
+        conn.commit()
+    finally:
+        conn.close()
+
+def _partition_dir(out_dir: str, province: Optional[str]) -> str:
+    # Same encoding pyarrow's hive partitioning decodes on read
+    value = quote(province, safe="") if province else HIVE_NULL_PARTITION
+    return os.path.join(out_dir, f"province={value}")
+
+def _write_partitions(conn, out_dir: str, model_version: str, batch_size: int) -> Tuple[int, List[str]]:
+    rows = 0
+    written: List[str] = []
+    writer = None
+    province = partition = None
+    file_rows = 0
+
+    def open_file():
+        path = os.path.join(partition, f"part-{len(os.listdir(partition))}.parquet")
+        written.append(path)
+        return pq.ParquetWriter(path, FILE_SCHEMA)
+
+    try:
+        for batch in iter_record_batches(conn, model_version, batch_size):
+            rows += batch.num_rows
+            offset = 0
+            for value, run in groupby(batch.column("province").to_pylist()):
+                length = sum(1 for _ in run)
+                if writer is None or value != province:
+                    if writer is not None:
+                        writer.close()
+                    province, partition = value, _partition_dir(out_dir, value)
+                    os.makedirs(partition)
+                    writer, file_rows = open_file(), 0
+                elif file_rows >= MAX_ROWS_PER_FILE:
+                    writer.close()
+                    writer, file_rows = open_file(), 0
+
+                writer.write_batch(batch.slice(offset, length).drop_columns(["province"]))
+                file_rows += length
+                offset += length
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return rows, written
+
+def export_parquet(
+    db_file: str = DB_FILE,
+    out_dir: str = EXPORT_DIR,
+    model_version: str = DEFAULT_MODEL_VERSION,
+    batch_size: int = BATCH_SIZE
+) -> Dict[str, Any]:
+    """
+    Write leads + current scores to Parquet under `out_dir`, partitioned
+    by province (province=ON/part-0.parquet, ...), replacing any previous
+    export.
+
+    The export is built in a sibling directory and renamed into place once
+    complete, so readers never see a mix of two runs and provinces that
+    no longer have leads don't linger.
+
+    Rows arrive sorted by province, so only one file is open at a time and
+    memory stays at roughly one batch regardless of table size.
+    """
+    start = time.perf_counter()
+    ensure_score_index(db_file)
+
+    target = os.path.normpath(out_dir)
+    tmp_dir = f"{target}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    conn = connect(db_file, read_only=True)
+    try:
+        rows, written = _write_partitions(conn, tmp_dir, model_version, batch_size)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    finally:
+        conn.close()
+    size = sum(os.path.getsize(path) for path in written)
+
+    # Two renames on the same filesystem; the old export is deleted last
+    old_dir = f"{target}.old-{os.getpid()}"
+    if os.path.exists(target):
+        os.rename(target, old_dir)
+    os.rename(tmp_dir, target)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        "rows": rows,
+        "files": len(written),
+        "bytes": size,
+        "seconds": round(elapsed, 3),
+        "out_dir": out_dir,
+        "model_version": model_version,
+    }
+    logging.info(f"Exported leads to Parquet | {summary}")
+    return summary
+
+def read_export(out_dir: str = EXPORT_DIR, province: Optional[str] = None, columns: Optional[List[str]] = None) -> pa.Table:
+    """
+    Read an export back as an Arrow table, optionally one province only.
+
+    Files are memory-mapped instead of read into intermediate buffers, and
+    only the requested columns and partitions are decoded. Stay in Arrow
+    (or use `.to_pandas(self_destruct=True)`) to avoid a second copy.
+    """
+    filters = [("province", "=", province)] if province else None
+    return pq.read_table(out_dir, columns=columns, filters=filters, partitioning=PARTITIONING, memory_map=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export leads and current scores to partitioned Parquet.")
+    parser.add_argument("--out", default=EXPORT_DIR)
+    parser.add_argument("--model-version", default=DEFAULT_MODEL_VERSION)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    summary = export_parquet(out_dir=args.out, model_version=args.model_version, batch_size=args.batch_size)
+    print(
+        f"Exported {summary['rows']} leads to {summary['files']} files "
+        f"({summary['bytes'] / 2**20:.1f} MB) in {summary['seconds']:.2f}s -> {summary['out_dir']}"
+    )
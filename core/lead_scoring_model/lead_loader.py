@@ -0,0 +1,111 @@
+import logging
+from typing import Dict, Any, Iterator, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_BATCH_SIZE = 50_000
+
+# Columns loaded as fixed-width numeric arrays (NULL -> NaN for floats)
+NUMERIC_COLUMNS = {
+    "id": np.int64,
+    "total_reviews": np.float32,
+    "average_rating": np.float32,
+}
+
+# Low-cardinality text columns loaded as integer codes + a category list
+CATEGORICAL_COLUMNS = ("clinic_main_type", "clinic_sub_type", "city", "province")
+
+# Text columns a stage only needs to know are present; requested as "has_<column>"
+# so the NULL check runs inside SQLite and the strings never reach Python
+PRESENCE_COLUMNS = ("phone", "email", "website_url", "website_desc")
+
+LEAD_COLUMNS = (*NUMERIC_COLUMNS, *CATEGORICAL_COLUMNS, *PRESENCE_COLUMNS, "clinic_name")
+
+def _column_expr(column: str) -> str:
+    if column.startswith("has_") and column[4:] in PRESENCE_COLUMNS:
+        return f"({column[4:]} IS NOT NULL) AS {column}"
+
+    if column in LEAD_COLUMNS:
+        return column
+
+    raise ValueError(f"Unknown lead column: {column}")
+
+def iter_lead_rows(conn, columns: Sequence[str], batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[List[tuple]]:
+    """
+    Stream `leads` in batches of plain tuples, projecting only `columns`.
+    Accepts raw column names as well as the "has_<column>" presence flags.
+    """
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT {', '.join(_column_expr(c) for c in columns)} FROM leads ORDER BY id")
+
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        yield rows
+
+def iter_leads(conn, columns: Sequence[str], batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Stream `leads` as dicts holding only `columns`, one batch in memory at a time.
+    """
+    for rows in iter_lead_rows(conn, columns, batch_size):
+        for row in rows:
+            yield dict(zip(columns, row))
+
+def load_lead_frame(conn, columns: Sequence[str], batch_size: int = DEFAULT_BATCH_SIZE) -> pd.DataFrame:
+    """
+    Load `leads` into a compact, typed DataFrame.
+
+    Numeric columns become float32/int64 arrays, categorical columns become
+    pandas Categoricals backed by int32 codes, and "has_<column>" requests
+    become bool flags. Rows are streamed in batches so peak memory is one
+    batch of tuples plus the compact arrays.
+    """
+    for column in columns:
+        if column in PRESENCE_COLUMNS:
+            raise ValueError(f"Free-text column '{column}' has no compact form; request 'has_{column}' instead.")
+        if column == "clinic_name":
+            raise ValueError("Free-text column 'clinic_name' has no compact form; stream it with iter_leads() instead.")
+
+    chunks: Dict[str, List[np.ndarray]] = {column: [] for column in columns}
+    lookups: Dict[str, Dict[str, int]] = {
+        column: {} for column in columns if column in CATEGORICAL_COLUMNS
+    }
+
+    for rows in iter_lead_rows(conn, columns, batch_size):
+        for column, values in zip(columns, zip(*rows)):
+            if column in NUMERIC_COLUMNS:
+                chunks[column].append(np.array(values, dtype=NUMERIC_COLUMNS[column]))
+
+            elif column in lookups:
+                lookup = lookups[column]
+                codes = np.fromiter(
+                    (-1 if v is None else lookup.setdefault(v, len(lookup)) for v in values),
+                    dtype=np.int32,
+                    count=len(values)
+                )
+                chunks[column].append(codes)
+
+            else:
+                chunks[column].append(np.array(values, dtype=bool))
+
+    data = {}
+    for column in columns:
+        if chunks[column]:
+            arr = np.concatenate(chunks[column])
+        else:
+            arr = np.empty(0, dtype=np.int32 if column in lookups else NUMERIC_COLUMNS.get(column, bool))
+        chunks[column] = None
+
+        if column in lookups:
+            data[column] = pd.Categorical.from_codes(arr, categories=list(lookups[column]))
+        else:
+            data[column] = arr
+
+    df = pd.DataFrame(data, columns=list(columns))
+    logging.info(
+        f"Loaded {len(df)} leads ({', '.join(columns)}) using "
+        f"{df.memory_usage(deep=True).sum() / 1e6:.1f} MB."
+    )
+    return df
@@ -1,21 +1,23 @@
-import sqlite3
 import json
 import logging
 import os
 from datetime import datetime, timezone
 from typing import Dict, Any
 
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, f1_score
 
+from config.config import DB_FILE, LOG_DIR
+from config.database import connect
+from config.queries import INSERT_LEAD_SCORE, LEAD_SCORES_INDEX_SCHEMA, LEAD_SCORES_TABLE_SCHEMA
+from core.lead_scoring_model.lead_loader import load_lead_frame
+
 # --------------------------------
-# Paths & Logging
+# Logging
 # --------------------------------
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
-DB_FILE = os.path.join(PROJECT_ROOT, "datasets", "real_set_v1", "records.db")
-LOG_DIR = os.path.join(PROJECT_ROOT, "logs")
 os.makedirs(LOG_DIR, exist_ok=True)
 
 logging.basicConfig(
@@ -25,50 +27,48 @@ logging.basicConfig(
 )
 
 MODEL_VERSION = "ml_v1"
+TOP_FEATURES_COUNT = 3
 
-LEAD_SCORES_TABLE_SCHEMA = """
-CREATE TABLE IF NOT EXISTS lead_scores (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    leads_id INTEGER NOT NULL,
-    score REAL,
-    top_features TEXT,
-    explanation TEXT,
-    created_at DATETIME,
-    model_version TEXT,
-    FOREIGN KEY (leads_id) REFERENCES leads(id)
-);
-"""
+# Only what preprocess_features needs; contact fields are loaded as presence flags
+LEAD_COLUMNS = [
+    "id", "has_phone", "has_email", "has_website_url",
+    "total_reviews", "average_rating", "clinic_sub_type"
+]
 
 # -------------------------------
 # Helper functions
 # -------------------------------
 def get_connection():
-    return sqlite3.connect(DB_FILE)
+    return connect(DB_FILE)
 
 def ensure_table(conn):
     cursor = conn.cursor()
     cursor.execute(LEAD_SCORES_TABLE_SCHEMA)
+    cursor.execute(LEAD_SCORES_INDEX_SCHEMA)
     conn.commit()
 
 def fetch_leads(conn) -> pd.DataFrame:
-    conn.row_factory = sqlite3.Row
-    df = pd.read_sql_query("SELECT * FROM leads", conn)
+    df = load_lead_frame(conn, LEAD_COLUMNS)
     logging.info(f"Fetched {len(df)} leads from database.")
     return df
 
 def preprocess_features(df: pd.DataFrame) -> pd.DataFrame:
     # Create features from leads
-    df_feat = pd.DataFrame()
-    df_feat['has_phone'] = df['phone'].notnull().astype(int)
-    df_feat['has_email'] = df['email'].notnull().astype(int)
-    df_feat['has_website'] = df['website_url'].notnull().astype(int)
+    df_feat = pd.DataFrame(index=df.index)
+    df_feat['has_phone'] = df['has_phone'].astype(int)
+    df_feat['has_email'] = df['has_email'].astype(int)
+    df_feat['has_website'] = df['has_website_url'].astype(int)
     df_feat['total_reviews'] = df['total_reviews'].fillna(0)
     df_feat['average_rating'] = df['average_rating'].fillna(0.0)
     
-    # One-hot encode subtypes for keywords
+    # One-hot encode subtypes for keywords, matching each distinct subtype once
+    subtypes = df['clinic_sub_type'].astype("category")
+    categories = subtypes.cat.categories.str.lower()
+    codes = subtypes.cat.codes.to_numpy()
     keywords = ["dental", "physio", "clinic", "spa"]
     for kw in keywords:
-        df_feat[f'subtype_{kw}'] = df['clinic_sub_type'].fillna("").str.lower().apply(lambda x: int(kw in x))
+        matches = np.append(categories.str.contains(kw, regex=False).astype(int), 0)
+        df_feat[f'subtype_{kw}'] = matches[codes]
     
     return df_feat
 
@@ -90,21 +90,78 @@ def compute_pseudo_labels(df: pd.DataFrame) -> pd.Series:
     
     return df.apply(score_row, axis=1)
 
-def insert_score(conn, leads_id: int, score: float, explanation: str):
+def _tree_leaf_contributions(estimator, n_features: int, class_index: int):
+    """
+    Cumulative path contributions for every node of a single decision tree.
+
+    Row `node` holds, per feature, the total change in the predicted
+    probability of `class_index` along the root-to-node path, attributed to
+    the feature each split used. A sample's contributions are simply the
+    row of the leaf it lands in, so the per-sample cost is a lookup.
+    """
+    tree = estimator.tree_
+    values = tree.value[:, 0, :]
+    probs = values[:, class_index] / values.sum(axis=1)
+
+    node_contrib = np.zeros((tree.node_count, n_features))
+    frontier = np.array([0])
+
+    # Walk the tree one depth level at a time so each level is vectorized
+    while frontier.size:
+        splits = frontier[tree.children_left[frontier] != -1]
+        left, right = tree.children_left[splits], tree.children_right[splits]
+        for children in (left, right):
+            node_contrib[children] = node_contrib[splits]
+            node_contrib[children, tree.feature[splits]] += probs[children] - probs[splits]
+        frontier = np.concatenate([left, right])
+
+    return probs[0], node_contrib
+
+def compute_feature_contributions(clf: RandomForestClassifier, X: pd.DataFrame, class_index: int = 1):
+    """
+    Tree-path (Saabas) feature contributions for a fitted random forest.
+
+    Returns (bias, contributions) where bias is the forest's expected
+    probability for `class_index` and contributions is an
+    (n_samples, n_features) array such that
+    bias + contributions.sum(axis=1) == clf.predict_proba(X)[:, class_index].
+    Leaves for the whole batch come from a single `apply` call, so
+    attribution costs about as much as prediction.
+    """
+    n_samples, n_features = X.shape
+    leaves = clf.apply(X)
+
+    bias = 0.0
+    contributions = np.zeros((n_samples, n_features))
+    for tree_idx, estimator in enumerate(clf.estimators_):
+        tree_bias, node_contrib = _tree_leaf_contributions(estimator, n_features, class_index)
+        bias += tree_bias
+        contributions += node_contrib[leaves[:, tree_idx]]
+
+    n_trees = len(clf.estimators_)
+    return bias / n_trees, contributions / n_trees
+
+def top_features_from_contributions(contributions: np.ndarray, feature_names, k: int = TOP_FEATURES_COUNT):
+    """
+    Names of the k features pushing each row's prediction the most,
+    ordered by absolute contribution and signed with the direction.
+    """
+    k = min(k, contributions.shape[1])
+    top_idx = np.argsort(-np.abs(contributions), axis=1)[:, :k]
+    top_vals = np.take_along_axis(contributions, top_idx, axis=1)
+    names = np.asarray(feature_names)[top_idx]
+
+    return [
+        [f"{name} ({val:+.3f})" for name, val in zip(row_names, row_vals) if val != 0]
+        for row_names, row_vals in zip(names, top_vals)
+    ]
+
+def insert_score(conn, leads_id: int, score: float, explanation: str, top_features=None):
     cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO lead_scores (
-            leads_id,
-            score,
-            top_features,
-            explanation,
-            created_at,
-            model_version
-        ) VALUES (?, ?, ?, ?, ?, ?)
-    """, (
+    cursor.execute(INSERT_LEAD_SCORE, (
         leads_id,
         score,
-        None,
+        json.dumps(top_features) if top_features is not None else None,
         explanation,
         datetime.now(timezone.utc).isoformat(),
         MODEL_VERSION
@@ -142,10 +199,17 @@ def run_ml_baseline():
     logging.info(f"ML Baseline | Accuracy: {acc:.3f}, F1: {f1:.3f}")
     print(f"ML Baseline | Accuracy: {acc:.3f}, F1: {f1:.3f}")
 
+    # Explain predictions with per-feature contributions
+    positive_class = len(clf.classes_) - 1
+    _, contributions = compute_feature_contributions(clf, X_test, class_index=positive_class)
+    top_features = top_features_from_contributions(contributions, X_test.columns)
+
     # Insert predictions into lead_scores
-    for idx, pred in zip(ids_test, preds):
+    for idx, pred, features in zip(ids_test, preds, top_features):
         explanation = f"ML predicted label: {pred}"
-        insert_score(conn, idx, float(pred), explanation)
+        if features:
+            explanation += f" | Top contributors: {', '.join(features)}"
+        insert_score(conn, int(idx), float(pred), explanation, features)
     
     logging.info("ML baseline scoring complete")
     conn.close()
@@ -3,11 +3,18 @@ import json
 import logging
 import os
 from datetime import datetime, timezone
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
+
+from config.config import DB_FILE, LOG_DIR
+from config.database import connect
+from config.queries import (
+    ALREADY_SCORED_QUERY,
+    INSERT_LEAD_SCORE,
+    LEAD_SCORES_INDEX_SCHEMA,
+    LEAD_SCORES_TABLE_SCHEMA,
+)
+from core.lead_scoring_model.lead_loader import iter_leads
 
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
-DB_FILE = os.path.join(PROJECT_ROOT, "datasets", "real_set_v1", "records.db")
-LOG_DIR = os.path.join(PROJECT_ROOT, "logs")
 os.makedirs(LOG_DIR, exist_ok=True)
 
 logging.basicConfig(
@@ -18,18 +25,11 @@ logging.basicConfig(
 
 MODEL_VERSION = "rules_v1"
 
-LEAD_SCORES_TABLE_SCHEMA = """
-CREATE TABLE IF NOT EXISTS lead_scores (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    leads_id INTEGER NOT NULL,
-    score REAL,
-    top_features TEXT,
-    explanation TEXT,
-    created_at DATETIME,
-    model_version TEXT,
-    FOREIGN KEY (leads_id) REFERENCES leads(id)
-);
-"""
+# Only what rules_based_score reads
+LEAD_COLUMNS = [
+    "id", "phone", "email", "website_url",
+    "total_reviews", "average_rating", "clinic_sub_type"
+]
 
 def rules_based_score(lead: Dict[str, Any]) -> Dict[str, Any]:
     score = 0
@@ -79,13 +79,14 @@ def rules_based_score(lead: Dict[str, Any]) -> Dict[str, Any]:
     return {"score": score, "top_features": top_features, "explanation": explanation}
 
 def get_connection():
-    return sqlite3.connect(DB_FILE)
+    return connect(DB_FILE)
 
 def ensure_tables(conn):
     try:
         cursor = conn.cursor()
         logging.info("Ensuring lead_scores table exists.")
         cursor.execute(LEAD_SCORES_TABLE_SCHEMA)
+        cursor.execute(LEAD_SCORES_INDEX_SCHEMA)
         conn.commit()
         logging.info("lead_scores table verified/created successfully.")
         
@@ -93,44 +94,24 @@ def ensure_tables(conn):
         logging.error(f"Error creating lead_scores table: {e}")
         raise
     
-def fetch_leads(conn):
+def fetch_leads(conn) -> Iterator[Dict[str, Any]]:
     try:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM leads")
-        rows = cursor.fetchall()
-        logging.info(f"Fetched {len(rows)} leads from the database.")
-        if rows:
-            logging.debug(f"Lead columns: {rows[0].keys()}")
-        return [dict(row) for row in rows]
+        logging.info(f"Streaming leads with columns: {LEAD_COLUMNS}")
+        yield from iter_leads(conn, LEAD_COLUMNS)
     
     except sqlite3.Error as e:
         logging.error(f"Failed to fetch leads: {e}")
-        return []
 
 def already_scored(conn, leads_id: int) -> bool:
     cursor = conn.cursor()
-    cursor.execute("""
-        SELECT 1 FROM lead_scores
-        WHERE leads_id = ? AND model_version = ?
-        LIMIT 1
-    """, (leads_id, MODEL_VERSION))
+    cursor.execute(ALREADY_SCORED_QUERY, (leads_id, MODEL_VERSION))
     return cursor.fetchone() is not None
 
 def insert_score(conn, leads_id: int, score_data: Dict[str, Any]):
     try:
         cursor = conn.cursor()
         logging.info(f"Inserting score for lead ID {leads_id}: {score_data['score']}")
-        cursor.execute("""
-            INSERT INTO lead_scores (
-                leads_id,
-                score,
-                top_features,
-                explanation,
-                created_at,
-                model_version
-            ) VALUES (?, ?, ?, ?, ?, ?)
-        """, (
+        cursor.execute(INSERT_LEAD_SCORE, (
             leads_id,
             score_data["score"],
             json.dumps(score_data["top_features"]),
@@ -155,7 +136,6 @@ def run_rules_baseline():
     ensure_tables(conn)
 
     leads = fetch_leads(conn)
-    logging.info(f"Fetched {len(leads)} leads")
 
     scored = 0
     skipped = 0
@@ -0,0 +1,204 @@
+import argparse
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+
+from config.config import DATASET_DIR, DB_FILE, LOG_DIR
+from config.database import connect
+from config.queries import (
+    LEAD_SCORES_ARCHIVE_TABLE_SCHEMA,
+    LEAD_SCORES_INDEX_SCHEMA,
+    LEAD_SCORES_TABLE_SCHEMA,
+    MAINTENANCE_STATE_TABLE_SCHEMA,
+    SUPERSEDED_SCORES_QUERY,
+)
+
+os.makedirs(LOG_DIR, exist_ok=True)
+logging.basicConfig(
+    filename=os.path.join(LOG_DIR, "score_retention.log"),
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+BATCH_SIZE = 5000
+BATCH_PAUSE = 0.01  # seconds between batches so other writers can take the lock
+ARCHIVE_DIR = os.path.join(DATASET_DIR, "lead_scores_archive")
+WATERMARK_KEY = "score_retention.last_scanned_id"
+
+SCORE_COLUMNS = ["id", "leads_id", "score", "top_features", "explanation", "created_at", "model_version"]
+
+# lead_scores column types plus archived_at. Fixed rather than inferred so a
+# batch that is all NULL in one column still matches the other part files.
+ARCHIVE_PARQUET_FIELDS = [
+    ("id", "int64"),
+    ("leads_id", "int64"),
+    ("score", "float64"),
+    ("top_features", "string"),
+    ("explanation", "string"),
+    ("created_at", "string"),
+    ("model_version", "string"),
+    ("archived_at", "string"),
+]
+
+def ensure_tables(conn):
+    cursor = conn.cursor()
+    cursor.execute(LEAD_SCORES_TABLE_SCHEMA)
+    cursor.execute(LEAD_SCORES_INDEX_SCHEMA)
+    cursor.execute(LEAD_SCORES_ARCHIVE_TABLE_SCHEMA)
+    cursor.execute(MAINTENANCE_STATE_TABLE_SCHEMA)
+    conn.commit()
+
+def get_watermark(conn) -> int:
+    row = conn.execute("SELECT value FROM maintenance_state WHERE key = ?", (WATERMARK_KEY,)).fetchone()
+    return int(row[0]) if row else 0
+
+def set_watermark(conn, value: int):
+    conn.execute("INSERT OR REPLACE INTO maintenance_state (key, value) VALUES (?, ?)", (WATERMARK_KEY, str(value)))
+    conn.commit()
+
+def table_stats(conn) -> Dict[str, Any]:
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    return {
+        "hot_rows": conn.execute("SELECT COUNT(*) FROM lead_scores").fetchone()[0],
+        "archive_rows": conn.execute("SELECT COUNT(*) FROM lead_scores_archive").fetchone()[0],
+        "db_bytes": page_size * page_count,
+        "free_bytes": page_size * freelist,
+    }
+
+def _write_parquet(rows: List[tuple], archive_dir: str, archived_at: str):
+    # pyarrow is only needed for the Parquet archive target
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    os.makedirs(archive_dir, exist_ok=True)
+    schema = pa.schema([(name, pa.type_for_alias(type_name)) for name, type_name in ARCHIVE_PARQUET_FIELDS])
+    columns = [list(values) for values in zip(*rows)] + [[archived_at] * len(rows)]
+    table = pa.Table.from_arrays(
+        [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+        schema=schema
+    )
+
+    # Named by id range so a retried batch overwrites its own file
+    path = os.path.join(archive_dir, f"part-{rows[0][0]:012d}-{rows[-1][0]:012d}.parquet")
+    pq.write_table(table, path)
+
+def archive_batch(conn, ids: List[int], target: str = "table", archive_dir: str = ARCHIVE_DIR) -> int:
+    """
+    Move the given lead_scores rows to the archive in one short transaction.
+
+    For the Parquet target the rows are read and the file written before the
+    write lock is taken; superseded rows never change, so only the DELETE
+    needs it.
+    """
+    archived_at = datetime.now(timezone.utc).isoformat()
+    # One JSON parameter instead of one placeholder per id (SQLite caps bound variables)
+    id_list = json.dumps(ids)
+    in_ids = "id IN (SELECT value FROM json_each(?))"
+
+    if target == "parquet":
+        rows = conn.execute(
+            f"SELECT {', '.join(SCORE_COLUMNS)} FROM lead_scores WHERE {in_ids} ORDER BY id", (id_list,)
+        ).fetchall()
+        if not rows:
+            return 0
+        _write_parquet(rows, archive_dir, archived_at)
+        # Delete exactly what was written
+        id_list = json.dumps([row[0] for row in rows])
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if target != "parquet":
+            conn.execute(f"""
+                INSERT OR IGNORE INTO lead_scores_archive ({', '.join(SCORE_COLUMNS)}, archived_at)
+                SELECT {', '.join(SCORE_COLUMNS)}, ? FROM lead_scores WHERE {in_ids}
+            """, (archived_at, id_list))
+
+        moved = conn.execute(f"DELETE FROM lead_scores WHERE {in_ids}", (id_list,)).rowcount
+        conn.commit()
+        return moved
+
+    except Exception:
+        conn.rollback()
+        raise
+
+def compact_scores(
+    conn,
+    target: str = "table",
+    batch_size: int = BATCH_SIZE,
+    max_batches: Optional[int] = None,
+    pause: float = BATCH_PAUSE,
+    archive_dir: str = ARCHIVE_DIR
+) -> Dict[str, Any]:
+    """
+    Keep only the latest score per (leads_id, model_version) in lead_scores.
+
+    Only groups that received a score since the last completed run are
+    examined. Superseded rows are archived `batch_size` at a time, each
+    batch in its own transaction. With `max_batches`, the job stops early
+    and the next run picks up the rest.
+    """
+    if target not in ("table", "parquet"):
+        raise ValueError(f"Unknown archive target: {target}")
+
+    ensure_tables(conn)
+    watermark = get_watermark(conn)
+    max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM lead_scores").fetchone()[0]
+
+    superseded = [row[0] for row in conn.execute(SUPERSEDED_SCORES_QUERY, (watermark,))]
+    logging.info(f"Found {len(superseded)} superseded scores in groups updated after id {watermark}")
+
+    archived = batches = 0
+    for start in range(0, len(superseded), batch_size):
+        if max_batches is not None and batches >= max_batches:
+            break
+
+        archived += archive_batch(conn, superseded[start:start + batch_size], target, archive_dir)
+        batches += 1
+        logging.info(f"Archived {archived}/{len(superseded)} superseded scores")
+        if pause:
+            time.sleep(pause)
+
+    complete = batches * batch_size >= len(superseded)
+    if complete:
+        set_watermark(conn, max_id)
+
+    return {"superseded": len(superseded), "archived": archived, "batches": batches, "complete": complete}
+
+def run_score_retention(db_file: str = DB_FILE, target: str = "table", batch_size: int = BATCH_SIZE, max_batches: Optional[int] = None):
+    logging.info(f"Starting score retention | target={target}")
+    conn = connect(db_file)
+    ensure_tables(conn)
+
+    before = table_stats(conn)
+    start = time.perf_counter()
+    result = compact_scores(conn, target=target, batch_size=batch_size, max_batches=max_batches)
+    elapsed = time.perf_counter() - start
+    after = table_stats(conn)
+    conn.close()
+
+    summary = (
+        f"Score retention {'complete' if result['complete'] else 'partial'} | "
+        f"archived={result['archived']}/{result['superseded']} in {result['batches']} batches, "
+        f"hot_rows {before['hot_rows']} -> {after['hot_rows']}, "
+        f"archive_rows {before['archive_rows']} -> {after['archive_rows']}, "
+        f"db_size {before['db_bytes'] / 2**20:.1f}MB -> {after['db_bytes'] / 2**20:.1f}MB "
+        f"(free {before['free_bytes'] / 2**20:.1f}MB -> {after['free_bytes'] / 2**20:.1f}MB), "
+        f"duration={elapsed:.2f}s"
+    )
+    logging.info(summary)
+    print(summary)
+    return result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive superseded lead_scores rows.")
+    parser.add_argument("--target", choices=["table", "parquet"], default="table")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--max-batches", type=int, default=None)
+    args = parser.parse_args()
+
+    run_score_retention(target=args.target, batch_size=args.batch_size, max_batches=args.max_batches)
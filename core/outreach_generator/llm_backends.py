@@ -0,0 +1,185 @@
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import httpx
+from ollama import Client
+
+HOSTED_OLLAMA_HOST = "https://ollama.com"
+HOSTED_OLLAMA_MODEL = "gpt-oss:120b"
+LOCAL_OLLAMA_HOST = "http://localhost:11434"
+LOCAL_OLLAMA_MODEL = "llama3.2"
+DEFAULT_BACKEND = "ollama_hosted"
+DEFAULT_MAX_CONCURRENCY = 4
+
+class LLMBackend:
+    """
+    Minimal text-generation interface used by the outreach generator.
+
+    `generate_batch` takes several prompts at once; backends that cannot
+    batch natively fall back to one request per prompt. Backends keep their
+    HTTP connections open between calls, so create one and reuse it.
+    """
+    name = "base"
+
+    def generate(self, prompt: str) -> str:
+        raise NotImplementedError
+
+    def generate_batch(self, prompts: List[str]) -> List[str]:
+        return [self.generate(prompt) for prompt in prompts]
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class OllamaBackend(LLMBackend):
+    """
+    Ollama chat API, hosted or self-hosted.
+
+    A single `ollama.Client` (and its pooled httpx connections) is shared
+    across calls. The chat API takes one conversation per request, so
+    `generate_batch` issues up to `max_concurrency` requests in parallel;
+    a local server batches them when started with OLLAMA_NUM_PARALLEL > 1.
+    """
+    name = "ollama"
+
+    def __init__(
+        self,
+        host: str,
+        model: str,
+        api_key: Optional[str] = None,
+        max_concurrency: int = 1,
+        timeout: Optional[float] = None
+    ):
+        self.host = host
+        self.model = model
+        self.max_concurrency = max(1, max_concurrency)
+        # Owned here so close() can release the pooled connections
+        self.transport = httpx.HTTPTransport(limits=httpx.Limits(
+            max_connections=self.max_concurrency,
+            max_keepalive_connections=self.max_concurrency
+        ))
+        self.client = Client(
+            host=host,
+            headers={"Authorization": f"Bearer {api_key}"} if api_key else None,
+            timeout=timeout,
+            transport=self.transport
+        )
+
+    def generate(self, prompt: str) -> str:
+        messages = [{"role": "user", "content": prompt}]
+        text = ""
+        for part in self.client.chat(self.model, messages=messages, stream=True):
+            text += part.message.content
+        return text
+
+    def generate_batch(self, prompts: List[str]) -> List[str]:
+        if self.max_concurrency == 1 or len(prompts) <= 1:
+            return super().generate_batch(prompts)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(prompts))) as pool:
+            return list(pool.map(self.generate, prompts))
+
+    def close(self):
+        self.transport.close()
+
+def max_concurrency_from_env() -> int:
+    return int(os.environ.get("LLM_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY))
+
+def hosted_ollama_backend(model: str = HOSTED_OLLAMA_MODEL, max_concurrency: Optional[int] = None) -> OllamaBackend:
+    return OllamaBackend(
+        host=HOSTED_OLLAMA_HOST,
+        model=model,
+        api_key=os.environ.get("OLLAMA_API"),
+        max_concurrency=max_concurrency or max_concurrency_from_env()
+    )
+
+def local_ollama_backend(host: Optional[str] = None, model: Optional[str] = None, max_concurrency: Optional[int] = None) -> OllamaBackend:
+    return OllamaBackend(
+        host=host or os.environ.get("OLLAMA_HOST", LOCAL_OLLAMA_HOST),
+        model=model or os.environ.get("OLLAMA_LOCAL_MODEL", LOCAL_OLLAMA_MODEL),
+        max_concurrency=max_concurrency or max_concurrency_from_env()
+    )
+
+class FakeBackend(LLMBackend):
+    """
+    Deterministic offline stand-in for load tests and benchmarks.
+
+    Each request costs `latency` seconds plus output tokens divided by
+    `tokens_per_second`. `generate_batch` groups up to `max_batch_size`
+    prompts into one simulated request, paying the latency once per group.
+    The response for a prompt is always the same.
+    """
+    name = "fake"
+
+    def __init__(self, latency: float = 0.0, tokens_per_second: Optional[float] = None, max_batch_size: int = 8):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.max_batch_size = max(1, max_batch_size)
+        self.requests = 0
+        self.prompts = 0
+        self._lock = threading.Lock()
+
+    def _respond(self, prompt: str) -> str:
+        match = re.search(r"Clinic Name:\s*(.+)", prompt)
+        clinic_name = match.group(1).strip() if match else "your clinic"
+        digest = hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:8]
+        return (
+            f"Subject: Growing {clinic_name} with Lyyvora\n"
+            f"Body: Hi {clinic_name} team, I'm Sharmeen Aqeel, CEO of Lyyvora. "
+            f"We help clinics like yours scale with fast, transparent financing. "
+            f"Would you be open to a short call? (ref {digest})"
+        )
+
+    def _simulate(self, responses: List[str]):
+        with self._lock:
+            self.requests += 1
+            self.prompts += len(responses)
+
+        delay = self.latency
+        if self.tokens_per_second:
+            delay += sum(len(r.split()) for r in responses) / self.tokens_per_second
+        if delay > 0:
+            time.sleep(delay)
+
+    def generate(self, prompt: str) -> str:
+        response = self._respond(prompt)
+        self._simulate([response])
+        return response
+
+    def generate_batch(self, prompts: List[str]) -> List[str]:
+        responses = []
+        for start in range(0, len(prompts), self.max_batch_size):
+            chunk = [self._respond(p) for p in prompts[start:start + self.max_batch_size]]
+            self._simulate(chunk)
+            responses.extend(chunk)
+        return responses
+
+BACKENDS = {
+    "ollama_hosted": hosted_ollama_backend,
+    "ollama_local": local_ollama_backend,
+    "fake": FakeBackend,
+}
+
+def get_backend(name: Optional[str] = None, **kwargs) -> LLMBackend:
+    """
+    Build a backend by name; defaults to the LLM_BACKEND environment variable.
+    """
+    name = name or os.environ.get("LLM_BACKEND", DEFAULT_BACKEND)
+    try:
+        factory = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown LLM backend '{name}'. Choose from: {', '.join(BACKENDS)}") from None
+
+    logging.info(f"Using LLM backend: {name}")
+    return factory(**kwargs)
@@ -1,16 +1,17 @@
-import sqlite3
-from ollama import Client
 import os
+import re
+from datetime import datetime, timezone
 from dotenv import load_dotenv
 import logging
 import time
 
-load_dotenv()
+from config.config import DB_FILE, LOG_DIR
+from config.database import connect
+from config.queries import INSERT_OUTREACH_MESSAGE, OUTREACH_MESSAGES_TABLE_SCHEMA, TOP_CLINICS_QUERY
+from core.outreach_generator.llm_backends import LLMBackend, get_backend
+from core.outreach_generator.prompt_templates import DEFAULT_TEMPLATE_VERSION, get_template
 
-# Connect to your database
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
-DB_FILE = os.path.join(PROJECT_ROOT, "datasets", "real_set_v1", "records.db")
-LOG_DIR = os.path.join(PROJECT_ROOT, "logs")
+load_dotenv()
 
 os.makedirs(LOG_DIR, exist_ok=True)
 logging.basicConfig(
@@ -19,95 +20,114 @@ logging.basicConfig(
     format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
-conn = sqlite3.connect(DB_FILE)  # replace with your DB path
-cursor = conn.cursor()
-
-# Your query
-query = """
-SELECT l.clinic_name, l.clinic_sub_type, l.city, l.website_desc 
-FROM leads l
-LEFT JOIN lead_scores s 
-ON l.id = s.leads_id 
-ORDER BY s.score DESC
-LIMIT 5;
-"""
-
-cursor.execute(query)
-rows = cursor.fetchall()
-
-# Convert rows into a list of dictionaries
-columns = [desc[0] for desc in cursor.description]  # get column names
-clinic_infos = [dict(zip(columns, row)) for row in rows]
-
-client = Client(
-    host="https://ollama.com",
-    headers={"Authorization": f"Bearer {os.environ.get('OLLAMA_API')}"}
-)
+BATCH_SIZE = 8
+
+# Created on first use so importing this module never opens a connection
+_backend = None
+
+def get_default_backend() -> LLMBackend:
+    global _backend
+    if _backend is None:
+        _backend = get_backend()
+    return _backend
+
+def fetch_top_clinics(conn, limit: int = 5):
+    cursor = conn.cursor()
+    cursor.execute(TOP_CLINICS_QUERY, (limit,))
+    rows = cursor.fetchall()
 
-MAX_WORDS = 120
-OLLAMA_MODEL = "gpt-oss:120b"
+    # Convert rows into a list of dictionaries
+    columns = [desc[0] for desc in cursor.description]  # get column names
+    return [dict(zip(columns, row)) for row in rows]
 
-def generate_email(clinic_info):
-    
+def parse_email(email_text: str):
+    """
+    Split a "Subject: ... Body: ..." response into (subject_line, message_body).
+    Falls back to (None, whole text) when the model ignores the format.
+    """
+    match = re.search(r"Subject:\s*(.*?)\s*Body:\s*(.*)", email_text, re.DOTALL | re.IGNORECASE)
+    if not match:
+        return None, email_text.strip()
+
+    return match.group(1).strip(), match.group(2).strip()
+
+def save_message(conn, leads_id: int, email_text: str, template_version: str, channel: str = "email", variant: str = None):
+    # The A/B variant defaults to the template version it was generated from
+    subject_line, message_body = parse_email(email_text)
+    cursor = conn.cursor()
+    cursor.execute(OUTREACH_MESSAGES_TABLE_SCHEMA)
+    cursor.execute(INSERT_OUTREACH_MESSAGE, (
+        leads_id,
+        channel,
+        variant or template_version,
+        template_version,
+        subject_line,
+        message_body,
+        datetime.now(timezone.utc).isoformat()
+    ))
+    conn.commit()
+
+def generate_email(clinic_info, template_version: str = DEFAULT_TEMPLATE_VERSION, backend: LLMBackend = None):
+    backend = backend or get_default_backend()
     clinic_name = clinic_info.get("clinic_name", "N/A")
 
     start_time = time.perf_counter()
-    logging.info(f"START email generation for clinic: {clinic_name}")
-
-    
-    prompt = f"""
-    You are Sharmeen Aqeel, Founder and CEO of Lyyvora, a Lending-as-a-Service platform for healthcare clinics.
-    
-    Write a concise, human-like email (max {MAX_WORDS} words) to the clinic below.
-    Personalize it using these details:
-
-    - Clinic Name: {clinic_info.get('clinic_name', 'N/A')}
-    - Specialties: {clinic_info.get('clinic_sub_type', 'N/A')}
-    - City: {clinic_info.get('city', 'N/A')}
-    - Brief Description: {clinic_info.get('website_desc', 'N/A')}
-
-    Include:
-    - A friendly introduction referencing the clinic or its specialty
-    - Lyyvora branding and Sharmeen Aqeel as the CEO
-    - How Lyyvora can help clinics scale with fast, transparent financing
-    - A polite call-to-action to schedule a call or learn more
-
-    Guardrails:
-    - Do NOT promise loan approval
-    - Avoid aggressive sales language
-    - Keep it professional, friendly, and human
-
-    **Output format:**  
-    Subject: <subject line here>  
-    Body: <email body here>
-    
-    """
-    messages = [{"role": "user", "content": prompt}]
-    email_text = ""
-    for part in client.chat(OLLAMA_MODEL, messages=messages, stream=True):
-        email_text += part.message.content
-        
+    logging.info(f"START email generation for clinic: {clinic_name} | template={template_version}")
+
+    prompt = get_template(template_version).render(clinic_info)
+    email_text = backend.generate(prompt)
+
     elapsed = time.perf_counter() - start_time
 
     logging.info(
         f"END email generation for clinic: {clinic_name} | "
-        f"duration={elapsed:.2f}s"
+        f"template={template_version} | backend={backend.name} | duration={elapsed:.2f}s"
     )
-    
+
     logging.info(f"RESPONSE for {clinic_name}:\n\n{email_text.strip()}")
-    
+
     return email_text.strip()
 
+def generate_emails(clinic_infos, template_version: str = DEFAULT_TEMPLATE_VERSION, backend: LLMBackend = None, batch_size: int = BATCH_SIZE):
+    """
+    Generate emails for many clinics, sending prompts to the backend in
+    batches of `batch_size`. Results are returned in input order.
+    """
+    backend = backend or get_default_backend()
+    template = get_template(template_version)
+    emails = []
+
+    for start in range(0, len(clinic_infos), batch_size):
+        batch = clinic_infos[start:start + batch_size]
+        batch_start = time.perf_counter()
+
+        prompts = [template.render(clinic_info) for clinic_info in batch]
+        emails.extend(text.strip() for text in backend.generate_batch(prompts))
+
+        logging.info(
+            f"Generated {len(batch)} emails | template={template_version} | "
+            f"backend={backend.name} | duration={time.perf_counter() - batch_start:.2f}s"
+        )
+
+    return emails
+
 
 if __name__=="__main__":
+    conn = connect(DB_FILE)
+    clinic_infos = fetch_top_clinics(conn)
+
     batch_start = time.perf_counter()
     logging.info("START outreach email generation batch")
 
-    for clinic_info in clinic_infos:
-        generate_email(clinic_info)
+    emails = generate_emails(clinic_infos, DEFAULT_TEMPLATE_VERSION)
+    for clinic_info, email_text in zip(clinic_infos, emails):
+        save_message(conn, clinic_info["leads_id"], email_text, DEFAULT_TEMPLATE_VERSION)
+
+    conn.close()
+    get_default_backend().close()
 
     batch_elapsed = time.perf_counter() - batch_start
     logging.info(
         f"END outreach email generation batch | "
         f"total_duration={batch_elapsed:.2f}s"
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,160 @@
+import logging
+import math
+from string import Formatter
+from textwrap import dedent
+from typing import Dict, Any, List, Optional, Tuple
+
+CHARS_PER_TOKEN = 4
+DEFAULT_MAX_PROMPT_TOKENS = 350
+DEFAULT_TEMPLATE_VERSION = "email_v1"
+TRUNCATION_MARKER = "..."
+
+# Fallbacks for slots the lead row does not provide
+DEFAULT_SLOT_VALUES = {
+    "clinic_name": "N/A",
+    "clinic_sub_type": "N/A",
+    "city": "N/A",
+    "website_desc": "N/A",
+    "bank_ready_offer": "Fast, transparent financing sized to the clinic's growth plans",
+    "risk_reversal": "No cost or obligation to explore financing options",
+}
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate (~4 characters per token for English text).
+    """
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+def trim_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Trim `text` on a word boundary so it fits in roughly `max_tokens` tokens.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    max_chars = max_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARKER)
+    if max_chars <= 0:
+        return ""
+
+    trimmed = text[:max_chars]
+    if " " in trimmed:
+        trimmed = trimmed.rsplit(" ", 1)[0]
+    return trimmed.rstrip(" ,.;:") + TRUNCATION_MARKER
+
+class PromptTemplate:
+    """
+    A versioned prompt compiled once into literal chunks and slot names.
+
+    Constants (e.g. the word limit) are baked in at compile time; the
+    remaining slots are filled from lead fields on every render. The
+    `trim_slot` is shortened so the whole prompt fits `max_prompt_tokens`.
+    """
+
+    def __init__(
+        self,
+        version: str,
+        text: str,
+        constants: Optional[Dict[str, Any]] = None,
+        trim_slot: str = "website_desc",
+        max_prompt_tokens: int = DEFAULT_MAX_PROMPT_TOKENS
+    ):
+        self.version = version
+        self.trim_slot = trim_slot
+        self.max_prompt_tokens = max_prompt_tokens
+
+        constants = constants or {}
+        parts: List[Tuple[str, Optional[str]]] = []
+        literal = ""
+        for text_part, field, _, _ in Formatter().parse(dedent(text).strip()):
+            literal += text_part
+            if field is None:
+                continue
+            if field in constants:
+                literal += str(constants[field])
+                continue
+            parts.append((literal, field))
+            literal = ""
+        parts.append((literal, None))
+
+        self._parts = parts
+        self.slots = [field for _, field in parts if field is not None]
+        self.base_tokens = estimate_tokens("".join(chunk for chunk, _ in parts))
+
+    def render(self, clinic_info: Dict[str, Any], max_prompt_tokens: Optional[int] = None) -> str:
+        if max_prompt_tokens is None:
+            max_prompt_tokens = self.max_prompt_tokens
+        values = {}
+        for slot in self.slots:
+            value = clinic_info.get(slot)
+            values[slot] = str(value).strip() if value not in (None, "") else DEFAULT_SLOT_VALUES.get(slot, "N/A")
+
+        if self.trim_slot in values:
+            used = self.base_tokens + sum(
+                estimate_tokens(value) for slot, value in values.items() if slot != self.trim_slot
+            )
+            original = values[self.trim_slot]
+            # No budget left for any of it: same placeholder as a missing value
+            values[self.trim_slot] = (
+                trim_to_tokens(original, max(max_prompt_tokens - used, 0))
+                or DEFAULT_SLOT_VALUES.get(self.trim_slot, "N/A")
+            )
+
+            if values[self.trim_slot] != original:
+                logging.info(
+                    f"Trimmed '{self.trim_slot}' for {values.get('clinic_name', 'N/A')} "
+                    f"from {estimate_tokens(original)} to {estimate_tokens(values[self.trim_slot])} tokens "
+                    f"(template={self.version})"
+                )
+
+        return "".join(
+            chunk + (values[field] if field is not None else "")
+            for chunk, field in self._parts
+        )
+
+PROMPT_TEMPLATES: Dict[str, PromptTemplate] = {}
+
+def register_template(template: PromptTemplate) -> PromptTemplate:
+    if template.version in PROMPT_TEMPLATES:
+        raise ValueError(f"Prompt template version already registered: {template.version}")
+
+    PROMPT_TEMPLATES[template.version] = template
+    return template
+
+def get_template(version: str = DEFAULT_TEMPLATE_VERSION) -> PromptTemplate:
+    try:
+        return PROMPT_TEMPLATES[version]
+    except KeyError:
+        raise KeyError(f"Unknown prompt template version: {version}") from None
+
+register_template(PromptTemplate(
+    version="email_v1",
+    constants={"max_words": 120},
+    text="""
+    You are Sharmeen Aqeel, Founder and CEO of Lyyvora, a Lending-as-a-Service platform for healthcare clinics.
+
+    Write a concise, human-like email (max {max_words} words) to the clinic below.
+    Personalize it using these details:
+
+    - Clinic Name: {clinic_name}
+    - Specialties: {clinic_sub_type}
+    - City: {city}
+    - Brief Description: {website_desc}
+
+    Include:
+    - A friendly introduction referencing the clinic or its specialty
+    - Lyyvora branding and Sharmeen Aqeel as the CEO
+    - How Lyyvora can help clinics scale with fast, transparent financing
+    - The offer: {bank_ready_offer}
+    - The reassurance: {risk_reversal}
+    - A polite call-to-action to schedule a call or learn more
+
+    Guardrails:
+    - Do NOT promise loan approval
+    - Avoid aggressive sales language
+    - Keep it professional, friendly, and human
+
+    **Output format:**
+    Subject: <subject line here>
+    Body: <email body here>
+    """
+))
@@ -0,0 +1,356 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Dict, Any, Callable, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+from bs4 import BeautifulSoup
+
+from config.config import DB_FILE, LOG_DIR, WEB_CACHE_DIR
+from config.database import connect
+from config.queries import (
+    LEAD_WEBSITE_FEATURES_TABLE_SCHEMA,
+    LEADS_WITH_WEBSITE_QUERY,
+    UPSERT_LEAD_WEBSITE_FEATURES,
+)
+
+os.makedirs(LOG_DIR, exist_ok=True)
+logging.basicConfig(
+    filename=os.path.join(LOG_DIR, "website_enrichment.log"),
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+# --------------------------------
+# Fetch settings
+# --------------------------------
+MAX_CONCURRENCY = 64          # requests in flight across all hosts
+PER_HOST_CONCURRENCY = 1      # requests in flight per host
+PER_HOST_DELAY = 1.0          # seconds between request starts on the same host
+REQUEST_TIMEOUT = 10.0
+MAX_BODY_BYTES = 2 * 1024 * 1024
+WRITE_BATCH_SIZE = 500
+USER_AGENT = "LyyvoraBot/1.0 (+https://lyyvora.com)"
+
+FINANCING_KEYWORDS = [
+    "financing", "payment plan", "monthly payments", "pay over time",
+    "interest-free", "0% interest", "flexible payment", "direct billing",
+    "insurance", "affordable", "medicard", "paybright", "afterpay"
+]
+TEAM_LINK_REGEX = re.compile(r"team|staff|doctors|practitioners|providers|dentists", re.I)
+BLOG_LINK_REGEX = re.compile(r"blog|news|articles|updates", re.I)
+# Matched on the original-case text: only capitalized name tokens, so
+# "Dr. Smith loves kids" stays "Smith". Counted by surname.
+PRACTITIONER_REGEX = re.compile(r"\b(?i:dr)\.?\s+([A-Z][\w'-]+(?:\s+(?!(?i:dr)\b)[A-Z][\w'-]+)?)")
+POSTAL_CODE_REGEX = re.compile(r"\b[abceghjklmnprstvxy]\d[abceghj-nprstv-z]\s?\d[abceghj-nprstv-z]\d\b")
+YEAR_REGEX = re.compile(r"\b(20\d{2})\b")
+
+# -------------------------------
+# Disk cache (conditional GET)
+# -------------------------------
+def _cache_path(cache_dir: str, url: str) -> str:
+    digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, digest[:2], f"{digest}.json")
+
+def load_cached(cache_dir: str, url: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(_cache_path(cache_dir, url), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def store_cached(cache_dir: str, url: str, entry: Dict[str, Any]):
+    path = _cache_path(cache_dir, url)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Write then rename so a crash never leaves a half-written entry
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, path)
+
+# -------------------------------
+# Politeness
+# -------------------------------
+class HostLimiter:
+    """
+    Caps concurrent requests per host and spaces out request starts on the
+    same host by at least `delay` seconds.
+    """
+
+    def __init__(self, concurrency: int = PER_HOST_CONCURRENCY, delay: float = PER_HOST_DELAY):
+        self.concurrency = concurrency
+        self.delay = delay
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    @asynccontextmanager
+    async def slot(self, host: str):
+        semaphore = self._semaphores.setdefault(host, asyncio.Semaphore(self.concurrency))
+        async with semaphore:
+            now = time.monotonic()
+            start_at = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start_at + self.delay
+            if start_at > now:
+                await asyncio.sleep(start_at - now)
+            yield
+
+def url_host(url: str) -> str:
+    # Malformed URLs (e.g. "http://[bad") still get queued and recorded as failed
+    try:
+        return urlparse(url).netloc.lower()
+    except ValueError:
+        return ""
+
+def interleave_by_host(leads: Iterable[Tuple[int, str]]) -> List[Tuple[int, str]]:
+    """
+    Round-robin (leads_id, url) pairs across hosts so workers are not all
+    queued behind one host's politeness delay.
+    """
+    by_host: Dict[str, List[Tuple[int, str]]] = {}
+    for leads_id, url in leads:
+        by_host.setdefault(url_host(url), []).append((leads_id, url))
+
+    ordered = []
+    queues = list(by_host.values())
+    for i in range(max((len(q) for q in queues), default=0)):
+        ordered.extend(q[i] for q in queues if i < len(q))
+    return ordered
+
+# -------------------------------
+# Fetching
+# -------------------------------
+def normalize_url(url: str) -> Optional[str]:
+    if not isinstance(url, str) or not url.strip():
+        return None
+
+    url = url.strip()
+    try:
+        has_scheme = bool(urlparse(url).scheme)
+    except ValueError:
+        # Malformed, e.g. "http://[bad"; fetch_site records it as failed
+        has_scheme = True
+    if not has_scheme:
+        url = f"https://{url}"
+    return url
+
+async def fetch_site(client: httpx.AsyncClient, url: str, limiter: HostLimiter, cache_dir: str = WEB_CACHE_DIR) -> Dict[str, Any]:
+    """
+    Fetch `url` with a conditional GET against the disk cache.
+
+    Returns {"url", "status", "body", "from_cache"}; body is None when the
+    site could not be fetched and nothing usable is cached.
+    """
+    cached = load_cached(cache_dir, url)
+    headers = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    host = url_host(url)
+    try:
+        async with limiter.slot(host):
+            async with client.stream("GET", url, headers=headers) as response:
+                if response.status_code == 304 and cached:
+                    return {"url": url, "status": 304, "body": cached["body"], "from_cache": True}
+
+                chunks, size = [], 0
+                async for chunk in response.aiter_bytes():
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size >= MAX_BODY_BYTES:
+                        break
+                body = b"".join(chunks)[:MAX_BODY_BYTES].decode(response.encoding or "utf-8", errors="replace")
+
+    # InvalidURL (bad port, control characters) is not an HTTPError subclass
+    except (httpx.HTTPError, httpx.InvalidURL) as e:
+        logging.warning(f"Failed to fetch {url}: {e!r}")
+        if cached:
+            return {"url": url, "status": None, "body": cached["body"], "from_cache": True}
+        return {"url": url, "status": None, "body": None, "from_cache": False}
+
+    if response.status_code != 200:
+        logging.warning(f"Unexpected status {response.status_code} for {url}")
+        # Keep the last good copy through transient 404/429/503s
+        if cached:
+            return {"url": url, "status": response.status_code, "body": cached["body"], "from_cache": True}
+        return {"url": url, "status": response.status_code, "body": None, "from_cache": False}
+
+    if response.headers.get("etag") or response.headers.get("last-modified"):
+        store_cached(cache_dir, url, {
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+            "body": body,
+        })
+
+    return {"url": url, "status": 200, "body": body, "from_cache": False}
+
+# -------------------------------
+# Feature extraction
+# -------------------------------
+def extract_features(html: Optional[str], current_year: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Scoring signals from a clinic homepage: financing keywords, clinic
+    size (named practitioners, distinct postal codes, team page) and
+    recent activity (blog/news links, latest year mentioned near them).
+    """
+    if not html:
+        return {
+            "financing_keyword_count": 0, "financing_keywords": [],
+            "practitioner_count": 0, "location_count": 0,
+            "has_team_page": False, "has_blog": False,
+            "latest_post_year": None, "word_count": 0,
+        }
+
+    current_year = current_year or datetime.now(timezone.utc).year
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style", "noscript"]):
+        tag.decompose()
+
+    raw_text = soup.get_text(" ", strip=True)
+    text = raw_text.lower()
+    links = [f"{a.get('href', '')} {a.get_text(' ', strip=True)}" for a in soup.find_all("a")]
+
+    keyword_hits = {kw: text.count(kw) for kw in FINANCING_KEYWORDS}
+    matched = [kw for kw, count in keyword_hits.items() if count]
+
+    # Post dates: <time datetime="..."> tags first, then years in the text
+    years = [
+        int(m.group(1))
+        for tag in soup.find_all("time")
+        for m in [YEAR_REGEX.search(tag.get("datetime", "") or tag.get_text())]
+        if m
+    ]
+    has_blog = any(BLOG_LINK_REGEX.search(link) for link in links)
+    if not years and has_blog:
+        years = [int(y) for y in YEAR_REGEX.findall(text)]
+    years = [y for y in years if 2000 <= y <= current_year]
+
+    return {
+        "financing_keyword_count": sum(keyword_hits.values()),
+        "financing_keywords": matched,
+        "practitioner_count": len({name.split()[-1].lower() for name in PRACTITIONER_REGEX.findall(raw_text)}),
+        "location_count": len({code.replace(" ", "") for code in POSTAL_CODE_REGEX.findall(text)}),
+        "has_team_page": any(TEAM_LINK_REGEX.search(link) for link in links),
+        "has_blog": has_blog,
+        "latest_post_year": max(years) if years else None,
+        "word_count": len(text.split()),
+    }
+
+# -------------------------------
+# Stage
+# -------------------------------
+async def enrich_sites(
+    leads: Iterable[Tuple[int, str]],
+    concurrency: int = MAX_CONCURRENCY,
+    limiter: Optional[HostLimiter] = None,
+    cache_dir: str = WEB_CACHE_DIR,
+    on_batch: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    batch_size: int = WRITE_BATCH_SIZE
+) -> List[Dict[str, Any]]:
+    """
+    Fetch and extract features for (leads_id, website_url) pairs using
+    `concurrency` workers over one pooled HTTP client.
+
+    With `on_batch`, results are handed over every `batch_size` sites and
+    not kept; otherwise they are all returned. Page bodies are never kept.
+    """
+    limiter = limiter or HostLimiter()
+    normalized = ((leads_id, normalize_url(url)) for leads_id, url in leads)
+    work: asyncio.Queue = asyncio.Queue()
+    for item in interleave_by_host((leads_id, url) for leads_id, url in normalized if url):
+        work.put_nowait(item)
+
+    results: List[Dict[str, Any]] = []
+    pending: List[Dict[str, Any]] = []
+
+    async def worker(client: httpx.AsyncClient):
+        while True:
+            try:
+                leads_id, url = work.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            fetched = await fetch_site(client, url, limiter, cache_dir)
+            # Parsing is CPU-bound; keep it off the event loop
+            body = fetched.pop("body")
+            features = await asyncio.to_thread(extract_features, body)
+            result = {"leads_id": leads_id, **fetched, "fetched": body is not None, **features}
+
+            if on_batch is None:
+                results.append(result)
+                continue
+            pending.append(result)
+            if len(pending) >= batch_size:
+                on_batch(pending[:])
+                pending.clear()
+
+    async with httpx.AsyncClient(
+        headers={"User-Agent": USER_AGENT},
+        timeout=REQUEST_TIMEOUT,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    ) as client:
+        n_workers = max(1, min(concurrency, work.qsize()))
+        await asyncio.gather(*(worker(client) for _ in range(n_workers)))
+
+    if on_batch is not None and pending:
+        on_batch(pending)
+    return results
+
+def save_features(conn, results: List[Dict[str, Any]]):
+    fetched_at = datetime.now(timezone.utc).isoformat()
+    conn.executemany(UPSERT_LEAD_WEBSITE_FEATURES, [
+        (
+            r["leads_id"], r["url"], r["status"], int(r["from_cache"]),
+            r["financing_keyword_count"], json.dumps(r["financing_keywords"]),
+            r["practitioner_count"], r["location_count"],
+            int(r["has_team_page"]), int(r["has_blog"]),
+            r["latest_post_year"], r["word_count"], fetched_at
+        )
+        for r in results
+    ])
+    conn.commit()
+
+def run_website_enrichment(db_file: str = DB_FILE, concurrency: int = MAX_CONCURRENCY, cache_dir: str = WEB_CACHE_DIR):
+    logging.info("Starting website enrichment")
+    start = time.perf_counter()
+
+    conn = connect(db_file)
+    conn.execute(LEAD_WEBSITE_FEATURES_TABLE_SCHEMA)
+    leads = conn.execute(LEADS_WITH_WEBSITE_QUERY).fetchall()
+    logging.info(f"Fetched {len(leads)} leads with a website")
+
+    counts = {"saved": 0, "fetched": 0, "cache_hits": 0}
+
+    def on_batch(results):
+        save_features(conn, results)
+        counts["saved"] += len(results)
+        counts["fetched"] += sum(1 for r in results if r["fetched"])
+        counts["cache_hits"] += sum(1 for r in results if r["from_cache"])
+        logging.info(f"Enriched {counts['saved']}/{len(leads)} leads")
+
+    asyncio.run(enrich_sites(leads, concurrency=concurrency, cache_dir=cache_dir, on_batch=on_batch))
+    conn.close()
+
+    elapsed = time.perf_counter() - start
+    summary = (
+        f"Website enrichment complete | sites={counts['saved']}, fetched={counts['fetched']}, "
+        f"cache_hits={counts['cache_hits']}, failed={counts['saved'] - counts['fetched']}, "
+        f"duration={elapsed:.1f}s, rate={counts['saved'] / elapsed * 3600 if elapsed else 0:.0f}/h"
+    )
+    logging.info(summary)
+    print(summary)
+
+if __name__ == "__main__":
+    run_website_enrichment()
@@ -1,12 +1,54 @@
-from fastapi import FastAPI, Depends
+import json
+
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi_service.database import Base, engine
-from fastapi_service.models.leads import Lead
+from fastapi.responses import StreamingResponse
+
+from config.database import get_read_pool
+from config.queries import LEAD_BY_ID_QUERY, LEAD_SCORES_BY_LEAD_QUERY, TOP_SCORED_LEADS_QUERY
+from core.lead_export.lead_export import iter_ipc_stream
 
 app=FastAPI(title="Lyyvora Lead Pipeline API")
 
+def rows_to_dicts(cursor, rows):
+    columns = [desc[0] for desc in cursor.description]
+    records = [dict(zip(columns, row)) for row in rows]
+    for record in records:
+        if record.get("top_features"):
+            record["top_features"] = json.loads(record["top_features"])
+    return records
+
 @app.get("/")
 def root():
     return{"message": "welcome"}
 
+# Sync handlers run in FastAPI's threadpool; each borrows a read-only
+# connection, so reads proceed while scoring jobs write (WAL)
+@app.get("/leads")
+def top_leads(model_version: str = "rules_v1", limit: int = Query(20, ge=1, le=500)):
+    with get_read_pool().connection() as conn:
+        cursor = conn.execute(TOP_SCORED_LEADS_QUERY, (model_version, limit))
+        return rows_to_dicts(cursor, cursor.fetchall())
+
+@app.get("/leads/{lead_id}")
+def lead_detail(lead_id: int):
+    with get_read_pool().connection() as conn:
+        cursor = conn.execute(LEAD_BY_ID_QUERY, (lead_id,))
+        leads = rows_to_dicts(cursor, cursor.fetchall())
+        if not leads:
+            raise HTTPException(status_code=404, detail=f"Lead {lead_id} not found")
+
+        cursor = conn.execute(LEAD_SCORES_BY_LEAD_QUERY, (lead_id,))
+        return {**leads[0], "scores": rows_to_dicts(cursor, cursor.fetchall())}
+
+# Arrow IPC stream of every lead with its current score, one record batch
+# at a time; read with pyarrow.ipc.open_stream(response) on the client.
+# Read-only, so it relies on the scoring jobs (or export_parquet) having
+# created idx_lead_scores_lead_model
+@app.get("/exports/leads")
+def export_leads(model_version: str = "rules_v1", batch_size: int = Query(10_000, ge=1_000, le=100_000)):
+    def stream():
+        with get_read_pool().connection() as conn:
+            yield from iter_ipc_stream(conn, model_version, batch_size)
 
+    return StreamingResponse(stream(), media_type="application/vnd.apache.arrow.stream")
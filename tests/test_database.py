@@ -0,0 +1,93 @@
+import sqlite3
+import threading
+
+import pytest
+
+from config.database import ConnectionPool, connect
+from config.queries import LEAD_SCORES_TABLE_SCHEMA, LEADS_TABLE_SCHEMA
+
+@pytest.fixture
+def db_file(tmp_path):
+    path = str(tmp_path / "records.db")
+    conn = connect(path)
+    conn.execute(LEADS_TABLE_SCHEMA)
+    conn.execute(LEAD_SCORES_TABLE_SCHEMA)
+    conn.execute("INSERT INTO leads (clinic_name, email) VALUES ('Smile Dental', 'a@example.com')")
+    conn.commit()
+    conn.close()
+    return path
+
+def test_writer_connection_uses_wal(db_file):
+    conn = connect(db_file)
+
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] > 0
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] != -2000
+    conn.close()
+
+def test_read_only_connection_rejects_writes(db_file):
+    conn = connect(db_file, read_only=True)
+
+    assert conn.execute("SELECT COUNT(*) FROM leads").fetchone()[0] == 1
+    with pytest.raises(sqlite3.OperationalError):
+        conn.execute("DELETE FROM leads")
+    conn.close()
+
+def test_readers_not_blocked_by_open_write(db_file):
+    writer = connect(db_file)
+    writer.execute("BEGIN IMMEDIATE")
+    writer.execute("INSERT INTO leads (clinic_name, email) VALUES ('Glow Spa', 'b@example.com')")
+
+    pool = ConnectionPool(db_file, size=2)
+    with pool.connection() as conn:
+        # Uncommitted row is invisible, but the read does not wait on the lock
+        assert conn.execute("SELECT COUNT(*) FROM leads").fetchone()[0] == 1
+
+    writer.commit()
+    with pool.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM leads").fetchone()[0] == 2
+
+    writer.close()
+    pool.close()
+
+def test_pool_bounded_and_reused_across_threads(db_file):
+    pool = ConnectionPool(db_file, size=2)
+    seen = set()
+    errors = []
+
+    def read():
+        try:
+            for _ in range(20):
+                with pool.connection() as conn:
+                    seen.add(id(conn))
+                    conn.execute("SELECT * FROM leads").fetchall()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=read) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert len(seen) <= 2
+    pool.close()
+
+def test_pool_close_closes_checked_out_connections(db_file):
+    pool = ConnectionPool(db_file, size=1)
+    with pool.connection() as held:
+        pool.close()
+        # Still usable by its holder until returned
+        held.execute("SELECT 1")
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        held.execute("SELECT 1")
+
+    # The returned connection freed its slot instead of going back to idle
+    with pool.connection() as conn:
+        assert conn is not held
+        conn.execute("SELECT 1")
+    assert pool._opened == 1
+    pool.close()
+    assert pool._opened == 0
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import config.database as database
+from config.database import ConnectionPool, connect
+from config.queries import INSERT_LEAD_SCORE, LEAD_SCORES_TABLE_SCHEMA, LEADS_TABLE_SCHEMA
+from fastapi_service.main import app
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    path = str(tmp_path / "records.db")
+    conn = connect(path)
+    conn.execute(LEADS_TABLE_SCHEMA)
+    conn.execute(LEAD_SCORES_TABLE_SCHEMA)
+    conn.executemany(
+        "INSERT INTO leads (clinic_name, email, city) VALUES (?, ?, ?)",
+        [("Smile Dental", "a@example.com", "Toronto"), ("Glow Spa", "b@example.com", "Calgary")]
+    )
+    conn.executemany(INSERT_LEAD_SCORE, [
+        (2, 95, json.dumps(["old"]), "Rules applied", "2024-12-01", "rules_v1"),
+        (1, 60, json.dumps(["Has valid email address."]), "Rules applied", "2025-01-01", "rules_v1"),
+        (2, 90, json.dumps(["Has valid phone number."]), "Rules applied", "2025-01-01", "rules_v1"),
+    ])
+    conn.commit()
+    conn.close()
+
+    pool = ConnectionPool(path, size=2)
+    monkeypatch.setattr(database, "_read_pool", pool)
+    yield TestClient(app)
+    pool.close()
+
+def test_top_leads(client):
+    response = client.get("/leads", params={"limit": 5})
+
+    assert response.status_code == 200
+    leads = response.json()
+    # Only the latest score per lead, not the older higher one
+    assert [lead["clinic_name"] for lead in leads] == ["Glow Spa", "Smile Dental"]
+    assert [lead["score"] for lead in leads] == [90, 60]
+    assert leads[0]["top_features"] == ["Has valid phone number."]
+
+def test_lead_detail(client):
+    response = client.get("/leads/1")
+
+    assert response.status_code == 200
+    assert response.json()["clinic_name"] == "Smile Dental"
+    assert response.json()["scores"][0]["score"] == 60
+
+def test_lead_detail_missing(client):
+    assert client.get("/leads/99").status_code == 404
@@ -1,11 +1,37 @@
+import pstats
+
+import pandas as pd
+import pytest
+
+import core.lead_data_pipeline.lead_data_pipeline as pipeline
 from core.lead_data_pipeline.lead_data_pipeline import (
     clean_text,
     clean_phone,
     get_primary_email,
     clean_website,
-    normalize_province
+    format_report,
+    normalize_province,
+    run_pipeline
 )
 
+RAW_ROWS = [
+    # business_name, type, sub_types, city, state, business_phone, business_website, email_1, email_2, total_reviews
+    ("Smile Dental", "Dentist", "Dental clinic", "Toronto", "Ontario", "416-555-0101", "smiledental.ca", "info@smile.ca", None, "120"),
+    ("Smile Dental", "Dentist", "Dental clinic", "Toronto", "ON", "416-555-0199", None, "other@smile.ca", None, "120"),
+    ("Glow Spa", "Spa", "Medical spa", "Calgary", "AB", "416-555-0101", "invalid url", "glow@spa.ca", None, "unknown"),
+    ("Bay Physio", "Physio", "Physiotherapy", "Halifax", "NS", "123", None, "bad-email", None, "15"),
+    (None, "Physio", "Physiotherapy", "Regina", "SK", None, None, "noname@physio.ca", None, "3"),
+]
+
+@pytest.fixture
+def raw_csv(tmp_path):
+    path = tmp_path / "records.csv"
+    pd.DataFrame(RAW_ROWS, columns=[
+        "business_name", "type", "sub_types", "city", "state", "business_phone",
+        "business_website", "email_1", "email_2", "total_reviews"
+    ]).assign(website_desc=None, average_rating=4.5).to_csv(path, index=False)
+    return str(path)
+
 def test_clean_text_basic():
     assert clean_text("  hello world  ") == "hello world"
     assert clean_text("Dr. O'Brien") == "Dr. O'Brien"
@@ -57,4 +83,44 @@ def test_normalize_province_unknown():
     assert normalize_province("XYZ") == "XYZ"
 
 def test_normalize_province_none():
-    assert normalize_province(None) is None
\ No newline at end of file
+    assert normalize_province(None) is None
+
+def test_dry_run_does_not_write(raw_csv, monkeypatch):
+    saved = []
+    monkeypatch.setattr(pipeline, "save_to_sqlite", saved.append)
+
+    df, report = run_pipeline(raw_csv, dry_run=True)
+
+    assert saved == []
+    assert df["clinic_name"].tolist() == ["Smile Dental"]
+    assert "save_to_sqlite" not in [entry["step"] for entry in report]
+
+def test_report_counts_drops_and_invalid_values(raw_csv, monkeypatch):
+    monkeypatch.setattr(pipeline, "save_to_sqlite", lambda df: None)
+
+    _, report = run_pipeline(raw_csv)
+    steps = {entry["step"]: entry for entry in report}
+
+    assert steps["load_csv"]["rows_out"] == 5
+    assert steps["clean_phone"]["invalid"] == 1
+    assert steps["clean_website"]["invalid"] == 1
+    assert steps["primary_email"]["invalid"] == 1
+    assert steps["convert_numeric"]["invalid"] == 1
+    assert steps["dedupe_name_city"]["dropped"] == 1
+    assert steps["dedupe_phone"]["dropped"] == 1
+    assert steps["drop_missing_clinic_name"]["dropped"] == 1
+    assert steps["drop_missing_email"]["dropped"] == 1
+    assert steps["save_to_sqlite"]["rows_out"] == 1
+    # Each step starts where the previous one ended
+    assert all(a["rows_out"] == b["rows_in"] for a, b in zip(report, report[1:]))
+    assert "drop_missing_email" in format_report(report)
+
+def test_profile_writes_stats(raw_csv, tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline, "save_to_sqlite", lambda df: pytest.fail("profile run wrote to SQLite"))
+    profile_file = str(tmp_path / "pipeline.prof")
+
+    report = pipeline.main(raw_csv, profile=True, profile_file=profile_file)
+
+    assert report[-1]["step"] == "select_columns"
+    functions = {name for _, _, name in pstats.Stats(profile_file).stats}
+    assert "clean_phone" in functions
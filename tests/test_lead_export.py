@@ -0,0 +1,107 @@
+import json
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pytest
+from fastapi.testclient import TestClient
+
+import config.database as database
+from config.database import ConnectionPool, connect
+from config.queries import INSERT_LEAD_SCORE, LEAD_SCORES_TABLE_SCHEMA, LEADS_TABLE_SCHEMA
+from core.lead_export.lead_export import EXPORT_SCHEMA, export_parquet, iter_record_batches, read_export
+from fastapi_service.main import app
+
+@pytest.fixture
+def db_file(tmp_path):
+    path = str(tmp_path / "records.db")
+    conn = connect(path)
+    conn.execute(LEADS_TABLE_SCHEMA)
+    conn.execute(LEAD_SCORES_TABLE_SCHEMA)
+    conn.executemany(
+        "INSERT INTO leads (clinic_name, email, province, total_reviews, average_rating) VALUES (?, ?, ?, ?, ?)",
+        [
+            ("Smile Dental", "a@example.com", "ON", 120, 4.8),
+            ("Glow Spa", "b@example.com", "AB", None, None),
+            ("Bay Physio", "c@example.com", "ON", 15, 4.1),
+        ]
+    )
+    conn.executemany(INSERT_LEAD_SCORE, [
+        (1, 40, json.dumps(["old"]), "Rules applied", "2025-01-01", "rules_v1"),
+        (1, 60, json.dumps(["Has valid email address."]), "Rules applied", "2025-02-01", "rules_v1"),
+        (2, 90, json.dumps(["Has valid phone number."]), "Rules applied", "2025-01-01", "ml_v1"),
+    ])
+    conn.commit()
+    conn.close()
+    return path
+
+def test_iter_record_batches_latest_score(db_file):
+    conn = connect(db_file, read_only=True)
+    batches = list(iter_record_batches(conn, "rules_v1", batch_size=2))
+    conn.close()
+
+    assert [b.num_rows for b in batches] == [2, 1]
+    table = pa.Table.from_batches(batches)
+    assert table.schema == EXPORT_SCHEMA
+    # Latest rules_v1 score only; other model versions and unscored leads are null
+    assert table.column("score").to_pylist() == [None, 60, None]
+    assert table.column("total_reviews").to_pylist() == [None, 120, 15]
+
+def test_export_parquet_partitions_by_province(db_file, tmp_path):
+    out_dir = str(tmp_path / "export")
+    summary = export_parquet(db_file, out_dir, batch_size=2)
+
+    assert summary["rows"] == 3
+    assert summary["files"] == 2
+    assert sorted(p.name for p in (tmp_path / "export").iterdir()) == ["province=AB", "province=ON"]
+
+    ontario = read_export(out_dir, province="ON", columns=["id", "clinic_name", "score"])
+    assert ontario.column_names == ["id", "clinic_name", "score"]
+    assert sorted(ontario.column("id").to_pylist()) == [1, 3]
+
+def test_export_parquet_creates_score_index(db_file, tmp_path):
+    export_parquet(db_file, str(tmp_path / "export"))
+
+    conn = connect(db_file, read_only=True)
+    indexes = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")]
+    conn.close()
+    assert "idx_lead_scores_lead_model" in indexes
+
+def test_export_parquet_replaces_previous_run(db_file, tmp_path):
+    out_dir = str(tmp_path / "export")
+    export_parquet(db_file, out_dir)
+    export_parquet(db_file, out_dir)
+
+    table = read_export(out_dir)
+    assert table.num_rows == 3
+    assert sorted(table.column("province").to_pylist()) == ["AB", "ON", "ON"]
+
+def test_export_parquet_drops_stale_partitions(db_file, tmp_path):
+    out_dir = str(tmp_path / "export")
+    export_parquet(db_file, out_dir)
+
+    conn = connect(db_file)
+    conn.execute("DELETE FROM leads WHERE province = 'AB'")
+    conn.commit()
+    conn.close()
+    export_parquet(db_file, out_dir)
+
+    assert [p.name for p in (tmp_path / "export").iterdir()] == ["province=ON"]
+    # No temp or previous-run directories left next to it
+    assert [p.name for p in tmp_path.iterdir() if p.is_dir()] == ["export"]
+    assert read_export(out_dir).num_rows == 2
+
+def test_export_endpoint_streams_arrow(db_file):
+    pool = ConnectionPool(db_file, size=1)
+    original = database._read_pool
+    database._read_pool = pool
+    try:
+        response = TestClient(app).get("/exports/leads", params={"batch_size": 1000})
+    finally:
+        database._read_pool = original
+        pool.close()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    table = ipc.open_stream(response.content).read_all()
+    assert table.num_rows == 3
+    assert table.column("clinic_name").to_pylist() == ["Glow Spa", "Smile Dental", "Bay Physio"]
@@ -0,0 +1,65 @@
+import sqlite3
+
+import numpy as np
+import pytest
+
+from config.queries import LEADS_TABLE_SCHEMA
+from core.lead_scoring_model.lead_loader import iter_leads, load_lead_frame
+
+LEADS = [
+    ("Smile Dental", "Dental clinic", "Toronto", "ON", "2345678901", "a@example.com", "https://a.com", "Long text", 40, 4.6),
+    ("Core Physio", "Physiotherapy", "Ottawa", "ON", None, "b@example.com", None, None, None, None),
+    ("Glow Spa", "Medical spa", "Calgary", "AB", "3456789012", "c@example.com", "c.com", None, 5, 3.9),
+]
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(LEADS_TABLE_SCHEMA)
+    conn.executemany("""
+        INSERT INTO leads (clinic_name, clinic_sub_type, city, province, phone, email,
+                           website_url, website_desc, total_reviews, average_rating)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, LEADS)
+    yield conn
+    conn.close()
+
+def test_load_lead_frame_compact_types(conn):
+    df = load_lead_frame(conn, ["id", "has_phone", "total_reviews", "province", "clinic_sub_type"], batch_size=2)
+
+    assert df["id"].tolist() == [1, 2, 3]
+    assert df["has_phone"].dtype == bool
+    assert df["has_phone"].tolist() == [True, False, True]
+    assert df["total_reviews"].dtype == np.float32
+    assert np.isnan(df["total_reviews"].iloc[1])
+    assert df["province"].tolist() == ["ON", "ON", "AB"]
+    assert df["province"].cat.codes.tolist() == [0, 0, 1]
+    assert list(df["clinic_sub_type"].cat.categories) == ["Dental clinic", "Physiotherapy", "Medical spa"]
+
+def test_load_lead_frame_rejects_free_text(conn):
+    with pytest.raises(ValueError, match="has_website_desc"):
+        load_lead_frame(conn, ["id", "website_desc"])
+
+    # No presence flag exists for clinic_name, so the hint must not suggest one
+    with pytest.raises(ValueError, match="iter_leads") as exc:
+        load_lead_frame(conn, ["id", "clinic_name"])
+    assert "has_clinic_name" not in str(exc.value)
+
+def test_load_lead_frame_empty():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(LEADS_TABLE_SCHEMA)
+
+    df = load_lead_frame(conn, ["id", "has_email", "province"])
+
+    assert len(df) == 0
+    assert list(df.columns) == ["id", "has_email", "province"]
+
+def test_iter_leads_projects_columns(conn):
+    leads = list(iter_leads(conn, ["id", "phone", "clinic_sub_type"], batch_size=1))
+
+    assert leads[1] == {"id": 2, "phone": None, "clinic_sub_type": "Physiotherapy"}
+    assert all(set(lead) == {"id", "phone", "clinic_sub_type"} for lead in leads)
+
+def test_iter_leads_unknown_column(conn):
+    with pytest.raises(ValueError):
+        list(iter_leads(conn, ["id", "revenue"]))
@@ -0,0 +1,55 @@
+import time
+
+import pytest
+
+from core.outreach_generator.llm_backends import FakeBackend, OllamaBackend, get_backend
+
+def test_fake_backend_is_deterministic():
+    backend = FakeBackend()
+    prompt = "- Clinic Name: Smile Dental\n- City: Toronto"
+
+    first = backend.generate(prompt)
+
+    assert first == backend.generate(prompt)
+    assert "Smile Dental" in first
+    assert first.startswith("Subject:")
+    assert first != backend.generate("- Clinic Name: Glow Spa")
+
+def test_fake_backend_batches_requests():
+    backend = FakeBackend(max_batch_size=4)
+    prompts = [f"- Clinic Name: Clinic {i}" for i in range(10)]
+
+    responses = backend.generate_batch(prompts)
+
+    assert responses == [backend._respond(p) for p in prompts]
+    assert backend.requests == 3
+    assert backend.prompts == 10
+
+def test_fake_backend_latency_paid_once_per_batch():
+    backend = FakeBackend(latency=0.05, max_batch_size=8)
+
+    start = time.perf_counter()
+    backend.generate_batch(["a"] * 8)
+    batched = time.perf_counter() - start
+
+    assert 0.05 <= batched < 0.2
+
+def test_get_backend():
+    assert isinstance(get_backend("fake", latency=0.01), FakeBackend)
+    with get_backend("ollama_local") as backend:
+        assert isinstance(backend, OllamaBackend)
+
+    with pytest.raises(ValueError):
+        get_backend("missing")
+
+def test_ollama_concurrency_from_env(monkeypatch):
+    monkeypatch.setenv("LLM_MAX_CONCURRENCY", "6")
+
+    with get_backend("ollama_hosted") as backend:
+        assert backend.max_concurrency == 6
+    with get_backend("ollama_local", max_concurrency=2) as backend:
+        assert backend.max_concurrency == 2
+
+def test_get_backend_from_env(monkeypatch):
+    monkeypatch.setenv("LLM_BACKEND", "fake")
+    assert isinstance(get_backend(), FakeBackend)
@@ -0,0 +1,113 @@
+import json
+import sqlite3
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+import core.lead_scoring_model.ml_baseline as ml_baseline
+from config.database import connect
+from config.queries import LEADS_TABLE_SCHEMA
+from core.lead_scoring_model.ml_baseline import (
+    compute_feature_contributions,
+    compute_pseudo_labels,
+    fetch_leads,
+    preprocess_features,
+    top_features_from_contributions
+)
+
+def make_leads(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    subtypes = np.array(["Dental clinic", "Physiotherapy", "Medical spa", "Yoga", None], dtype=object)
+    return pd.DataFrame({
+        "phone": np.where(rng.random(n) > 0.3, "2345678901", None),
+        "email": np.where(rng.random(n) > 0.2, "a@example.com", None),
+        "website_url": np.where(rng.random(n) > 0.5, "example.com", None),
+        "total_reviews": rng.integers(0, 80, n).astype(float),
+        "average_rating": rng.uniform(3.0, 5.0, n),
+        "clinic_sub_type": subtypes[rng.integers(0, len(subtypes), n)]
+    })
+
+def load_leads(df):
+    conn = sqlite3.connect(":memory:")
+    df.assign(id=range(1, len(df) + 1)).to_sql("leads", conn, index=False)
+    leads = fetch_leads(conn)
+    conn.close()
+    return leads
+
+def fit_forest(X, y):
+    clf = RandomForestClassifier(n_estimators=10, random_state=42)
+    clf.fit(X, y)
+    return clf
+
+def test_contributions_sum_to_prediction():
+    X = preprocess_features(load_leads(make_leads()))
+    clf = fit_forest(X, compute_pseudo_labels(X))
+
+    bias, contributions = compute_feature_contributions(clf, X)
+
+    assert contributions.shape == X.shape
+    np.testing.assert_allclose(
+        bias + contributions.sum(axis=1),
+        clf.predict_proba(X)[:, 1],
+        atol=1e-9
+    )
+
+def test_top_features_ordered_by_magnitude():
+    contributions = np.array([
+        [0.1, -0.4, 0.0, 0.2],
+        [0.0, 0.0, 0.0, 0.0]
+    ])
+    names = ["has_phone", "has_email", "has_website", "total_reviews"]
+
+    top = top_features_from_contributions(contributions, names, k=3)
+
+    assert top[0] == ["has_email (-0.400)", "total_reviews (+0.200)", "has_phone (+0.100)"]
+    assert top[1] == []
+
+def test_preprocess_features_from_lean_frame():
+    df = pd.DataFrame({
+        "phone": ["2345678901", None],
+        "email": ["a@example.com", "b@example.com"],
+        "website_url": [None, "example.com"],
+        "total_reviews": [12.0, None],
+        "average_rating": [None, 4.8],
+        "clinic_sub_type": ["Dental clinic", None]
+    })
+
+    X = preprocess_features(load_leads(df))
+
+    assert X["has_phone"].tolist() == [1, 0]
+    assert X["has_website"].tolist() == [0, 1]
+    assert X["total_reviews"].tolist() == [12.0, 0.0]
+    assert X["subtype_dental"].tolist() == [1, 0]
+    assert X["subtype_clinic"].tolist() == [1, 0]
+    assert X["subtype_spa"].tolist() == [0, 0]
+
+def test_run_ml_baseline_writes_top_features(tmp_path, monkeypatch):
+    db_file = str(tmp_path / "records.db")
+    leads = make_leads()
+    n = len(leads)
+    # phone and email are UNIQUE in the leads schema
+    leads["phone"] = [f"{2000000000 + i}" if phone else None for i, phone in enumerate(leads["phone"])]
+    leads["email"] = [f"lead{i}@example.com" for i in range(n)]
+    conn = connect(db_file)
+    conn.execute(LEADS_TABLE_SCHEMA)
+    leads.assign(clinic_name=[f"Clinic {i}" for i in range(n)]).to_sql("leads", conn, if_exists="append", index=False)
+    conn.close()
+    monkeypatch.setattr(ml_baseline, "get_connection", lambda: connect(db_file))
+
+    ml_baseline.run_ml_baseline()
+
+    conn = connect(db_file)
+    rows = conn.execute("SELECT top_features, explanation, model_version FROM lead_scores").fetchall()
+    conn.close()
+
+    assert len(rows) == n // 5  # the 20% test split is scored
+    feature_names = set(preprocess_features(load_leads(make_leads())).columns)
+    for top_features, explanation, model_version in rows:
+        features = json.loads(top_features)
+        assert model_version == "ml_v1"
+        assert 0 < len(features) <= ml_baseline.TOP_FEATURES_COUNT
+        assert all(feature.split(" (")[0] in feature_names for feature in features)
+        assert explanation.endswith(f"Top contributors: {', '.join(features)}")
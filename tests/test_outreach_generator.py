@@ -1,6 +1,8 @@
 import os
 import pytest
-from core.outreach_generator.outreach_generator import generate_email
+from config.database import connect
+from core.outreach_generator.llm_backends import FakeBackend
+from core.outreach_generator.outreach_generator import generate_email, generate_emails, parse_email, save_message
 
 clinic_info_example = {
     "clinic_name": "Smile Dental",
@@ -26,3 +28,36 @@ def test_generate_email_real():
     assert "Smile Dental" in email
     assert len(email) > 0
     assert "approval" not in email.lower()  # check guardrails
+
+def test_parse_email():
+    subject, body = parse_email("Subject: Growing Smile Dental\nBody: Hi team,\nLet's talk.")
+    assert subject == "Growing Smile Dental"
+    assert body == "Hi team,\nLet's talk."
+
+def test_parse_email_unformatted():
+    assert parse_email("  Hi team  ") == (None, "Hi team")
+
+def test_generate_email_fake_backend():
+    email = generate_email(clinic_info_example, backend=FakeBackend())
+
+    assert "Smile Dental" in email
+    assert "approval" not in email.lower()
+
+def test_generate_emails_batched_in_order():
+    backend = FakeBackend(max_batch_size=2)
+    clinics = [dict(clinic_info_example, clinic_name=f"Clinic {i}") for i in range(5)]
+
+    emails = generate_emails(clinics, backend=backend, batch_size=3)
+
+    assert len(emails) == 5
+    assert all(f"Clinic {i}" in email for i, email in enumerate(emails))
+    assert emails[0] == generate_email(clinics[0], backend=backend)
+
+def test_save_message_stores_variant_and_template_version(tmp_path):
+    conn = connect(str(tmp_path / "records.db"))
+    save_message(conn, 1, "Subject: Hi\nBody: Hello", "v2")
+    save_message(conn, 2, "Subject: Hi\nBody: Hello", "v2", variant="v2-short")
+
+    rows = conn.execute("SELECT leads_id, variant, template_version, subject_line FROM outreach_messages ORDER BY id").fetchall()
+    conn.close()
+    assert rows == [(1, "v2", "v2", "Hi"), (2, "v2-short", "v2", "Hi")]
@@ -0,0 +1,73 @@
+import pytest
+
+from core.outreach_generator.prompt_templates import (
+    DEFAULT_SLOT_VALUES,
+    PromptTemplate,
+    estimate_tokens,
+    get_template,
+    register_template,
+    trim_to_tokens
+)
+
+clinic_info_example = {
+    "clinic_name": "Smile Dental",
+    "clinic_sub_type": "Dental",
+    "city": "Toronto",
+    "website_desc": "Providing high-quality dental care since 2010",
+    "bank_ready_offer": "Flexible financing options for clinic upgrades",
+    "risk_reversal": "No upfront fees until financing is approved"
+}
+
+def test_render_fills_slots():
+    prompt = get_template("email_v1").render(clinic_info_example)
+
+    assert "Clinic Name: Smile Dental" in prompt
+    assert "City: Toronto" in prompt
+    assert "Flexible financing options for clinic upgrades" in prompt
+    assert "No upfront fees until financing is approved" in prompt
+    assert "max 120 words" in prompt
+    assert "{" not in prompt
+
+def test_render_uses_defaults_for_missing_slots():
+    prompt = get_template("email_v1").render({"clinic_name": "Smile Dental", "city": None})
+
+    assert "City: N/A" in prompt
+    assert DEFAULT_SLOT_VALUES["bank_ready_offer"] in prompt
+    assert DEFAULT_SLOT_VALUES["risk_reversal"] in prompt
+
+def test_render_trims_website_desc_to_budget():
+    template = get_template("email_v1")
+    long_info = dict(clinic_info_example, website_desc="Family dentistry and implants. " * 200)
+
+    prompt = template.render(long_info)
+
+    assert estimate_tokens(prompt) <= template.max_prompt_tokens
+    assert "Family dentistry and implants." in prompt
+    assert "..." in prompt
+
+def test_render_no_budget_falls_back_to_default():
+    long_info = dict(clinic_info_example, website_desc="Family dentistry and implants. " * 200)
+
+    # 0 is an explicit budget, not "use the template's"
+    prompt = get_template("email_v1").render(long_info, max_prompt_tokens=0)
+
+    assert "Family dentistry" not in prompt
+    assert f"Brief Description: {DEFAULT_SLOT_VALUES['website_desc']}" in prompt
+
+def test_trim_to_tokens():
+    assert trim_to_tokens("short text", 10) == "short text"
+    assert trim_to_tokens("one two three four five six", 3) == "one two..."
+    assert trim_to_tokens("anything", 0) == ""
+
+def test_template_constants_and_slots():
+    template = PromptTemplate("test_v1", "Hi {clinic_name}, in {max_words} words about {city}.", constants={"max_words": 50})
+
+    assert template.slots == ["clinic_name", "city"]
+    assert template.render({"clinic_name": "Glow Spa", "city": "Calgary"}) == "Hi Glow Spa, in 50 words about Calgary."
+
+def test_registry_versions():
+    with pytest.raises(KeyError):
+        get_template("missing_v0")
+
+    with pytest.raises(ValueError):
+        register_template(PromptTemplate("email_v1", "duplicate"))
@@ -0,0 +1,83 @@
+import pyarrow.parquet as pq
+import pytest
+
+from config.database import connect
+from config.queries import INSERT_LEAD_SCORE
+from core.lead_scoring_model.score_retention import compact_scores, ensure_tables
+
+def insert_scores(conn, rows):
+    conn.executemany(INSERT_LEAD_SCORE, [
+        (leads_id, score, None, "test", "2025-01-01", model_version)
+        for leads_id, score, model_version in rows
+    ])
+    conn.commit()
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = connect(str(tmp_path / "records.db"))
+    ensure_tables(conn)
+    # Three runs of rules_v1 for leads 1-2, one ml_v1 score for lead 1
+    insert_scores(conn, [(1, 10, "rules_v1"), (2, 20, "rules_v1"), (1, 11, "ml_v1")])
+    insert_scores(conn, [(1, 30, "rules_v1"), (2, 40, "rules_v1")])
+    insert_scores(conn, [(1, 50, "rules_v1"), (2, 60, "rules_v1")])
+    yield conn
+    conn.close()
+
+def hot_scores(conn):
+    return sorted(conn.execute("SELECT leads_id, model_version, score FROM lead_scores").fetchall())
+
+def test_keeps_latest_per_lead_and_model(conn):
+    result = compact_scores(conn, batch_size=2, pause=0)
+
+    assert result == {"superseded": 4, "archived": 4, "batches": 2, "complete": True}
+    assert hot_scores(conn) == [(1, "ml_v1", 11), (1, "rules_v1", 50), (2, "rules_v1", 60)]
+    assert sorted(r[0] for r in conn.execute("SELECT score FROM lead_scores_archive")) == [10, 20, 30, 40]
+
+def test_incremental_runs_only_touched_groups(conn):
+    compact_scores(conn, pause=0)
+    insert_scores(conn, [(2, 70, "rules_v1")])
+
+    result = compact_scores(conn, pause=0)
+
+    assert result["superseded"] == 1
+    assert hot_scores(conn) == [(1, "ml_v1", 11), (1, "rules_v1", 50), (2, "rules_v1", 70)]
+
+def test_max_batches_resumes_next_run(conn):
+    first = compact_scores(conn, batch_size=1, max_batches=3, pause=0)
+    second = compact_scores(conn, batch_size=1, pause=0)
+
+    assert first["archived"] == 3 and not first["complete"]
+    assert second["archived"] == 1 and second["complete"]
+    assert len(hot_scores(conn)) == 3
+
+def test_parquet_target(conn, tmp_path):
+    archive_dir = str(tmp_path / "archive")
+
+    compact_scores(conn, target="parquet", batch_size=3, pause=0, archive_dir=archive_dir)
+
+    table = pq.read_table(archive_dir)
+    assert sorted(table.column("score").to_pylist()) == [10, 20, 30, 40]
+    assert conn.execute("SELECT COUNT(*) FROM lead_scores_archive").fetchone()[0] == 0
+    assert len(hot_scores(conn)) == 3
+
+def test_parquet_target_mixed_null_features(tmp_path):
+    conn = connect(str(tmp_path / "mixed.db"))
+    ensure_tables(conn)
+    archive_dir = str(tmp_path / "archive")
+    # Old ml_v1 rows have no top_features; rules_v1 rows do
+    insert_scores(conn, [(lead, 1, "ml_v1") for lead in (1, 2, 3)])
+    conn.executemany(INSERT_LEAD_SCORE, [
+        (lead, 2, '["Has valid email address."]', "test", "2025-01-01", "rules_v1") for lead in (1, 2, 3)
+    ])
+    insert_scores(conn, [(lead, 3, model) for lead in (1, 2, 3) for model in ("ml_v1", "rules_v1")])
+
+    compact_scores(conn, target="parquet", batch_size=3, pause=0, archive_dir=archive_dir)
+    conn.close()
+
+    table = pq.read_table(archive_dir)
+    assert table.schema.field("top_features").type == "string"
+    assert sorted(table.column("top_features").to_pylist(), key=str) == [None] * 3 + ['["Has valid email address."]'] * 3
+
+def test_unknown_target(conn):
+    with pytest.raises(ValueError):
+        compact_scores(conn, target="csv")
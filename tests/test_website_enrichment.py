@@ -0,0 +1,186 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from config.database import connect
+from config.queries import LEADS_TABLE_SCHEMA
+from core.website_enrichment.website_enrichment import (
+    HostLimiter,
+    enrich_sites,
+    extract_features,
+    interleave_by_host,
+    normalize_url,
+    run_website_enrichment,
+    store_cached
+)
+
+CLINIC_PAGE = """
+<html><head><style>.x { color: red }</style></head><body>
+  <h1>Smile Dental</h1>
+  <p>Flexible payment plans and financing available. We offer direct billing to insurance.</p>
+  <p>Meet Dr. Jane Smith and Dr. Omar Khan.</p>
+  <p>Downtown: 100 King St W, Toronto ON M5X 1A9. Uptown: 2 Yonge St, Toronto ON M4W 2L1.</p>
+  <a href="/our-team">Our Team</a>
+  <a href="/blog">Blog</a>
+  <time datetime="2024-05-02">May 2, 2024</time>
+  <script>var financing = "not counted";</script>
+</body></html>
+"""
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Local stand-in for clinic websites with ETag support."""
+    stats = {"requests": 0, "not_modified": 0, "in_flight": 0, "max_in_flight": 0}
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with self.lock:
+            self.stats["requests"] += 1
+            self.stats["in_flight"] += 1
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.stats["in_flight"])
+        try:
+            time.sleep(0.02)
+            if self.path == "/missing":
+                self.send_response(404)
+                self.end_headers()
+                return
+
+            etag = f'"{self.path}-v1"'
+            if self.headers.get("If-None-Match") == etag:
+                with self.lock:
+                    self.stats["not_modified"] += 1
+                self.send_response(304)
+                self.end_headers()
+                return
+
+            body = CLINIC_PAGE.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with self.lock:
+                self.stats["in_flight"] -= 1
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    StandInHandler.stats.update(requests=0, not_modified=0, in_flight=0, max_in_flight=0)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", StandInHandler.stats
+    httpd.shutdown()
+    httpd.server_close()
+
+def test_extract_features():
+    features = extract_features(CLINIC_PAGE, current_year=2025)
+
+    assert set(features["financing_keywords"]) >= {"financing", "payment plan", "direct billing", "insurance"}
+    assert features["practitioner_count"] == 2
+    # Repeated mentions and following lowercase words don't add practitioners
+    repeated = "<p>Dr. Smith. Dr. Smith is our lead dentist and Dr. Smith loves kids. Dr Jones too.</p>"
+    assert extract_features(repeated)["practitioner_count"] == 2
+    assert features["location_count"] == 2
+    assert features["has_team_page"] is True
+    assert features["has_blog"] is True
+    assert features["latest_post_year"] == 2024
+
+def test_extract_features_empty():
+    features = extract_features(None)
+    assert features["word_count"] == 0
+    assert features["latest_post_year"] is None
+
+def test_normalize_url():
+    assert normalize_url("example.com") == "https://example.com"
+    assert normalize_url("http://example.com") == "http://example.com"
+    assert normalize_url("  ") is None
+
+def test_interleave_by_host():
+    leads = [(1, "https://a.com/1"), (2, "https://a.com/2"), (3, "https://b.com"), (4, "https://a.com/3")]
+    assert [leads_id for leads_id, _ in interleave_by_host(leads)] == [1, 3, 2, 4]
+
+def test_conditional_get_uses_cache(server, tmp_path):
+    base_url, stats = server
+    leads = [(i, f"{base_url}/clinic/{i}") for i in range(5)]
+    limiter = lambda: HostLimiter(concurrency=5, delay=0)
+
+    first = asyncio.run(enrich_sites(leads, limiter=limiter(), cache_dir=str(tmp_path)))
+    second = asyncio.run(enrich_sites(leads, limiter=limiter(), cache_dir=str(tmp_path)))
+
+    assert all(r["status"] == 200 and not r["from_cache"] for r in first)
+    assert all(r["status"] == 304 and r["from_cache"] for r in second)
+    assert stats["not_modified"] == 5
+    assert [r["practitioner_count"] for r in second] == [r["practitioner_count"] for r in first]
+
+def test_per_host_limit(server, tmp_path):
+    base_url, stats = server
+    leads = [(i, f"{base_url}/clinic/{i}") for i in range(6)]
+
+    start = time.perf_counter()
+    asyncio.run(enrich_sites(leads, concurrency=6, limiter=HostLimiter(concurrency=1, delay=0.05), cache_dir=str(tmp_path)))
+    elapsed = time.perf_counter() - start
+
+    assert stats["requests"] == 6
+    assert stats["max_in_flight"] == 1
+    assert elapsed >= 5 * 0.05
+
+def test_failed_fetch(server, tmp_path):
+    base_url, _ = server
+    results = asyncio.run(enrich_sites(
+        [(1, f"{base_url}/missing"), (2, "http://127.0.0.1:1/closed")],
+        limiter=HostLimiter(delay=0), cache_dir=str(tmp_path)
+    ))
+
+    by_id = {r["leads_id"]: r for r in results}
+    assert by_id[1]["status"] == 404 and not by_id[1]["fetched"]
+    assert by_id[2]["status"] is None and not by_id[2]["fetched"]
+
+def test_error_status_falls_back_to_cache(server, tmp_path):
+    base_url, _ = server
+    url = f"{base_url}/missing"
+    store_cached(str(tmp_path), url, {"etag": '"/missing-v1"', "last_modified": None, "fetched_at": None, "body": CLINIC_PAGE})
+
+    result, = asyncio.run(enrich_sites([(1, url)], limiter=HostLimiter(delay=0), cache_dir=str(tmp_path)))
+
+    assert result["status"] == 404 and result["from_cache"] and result["fetched"]
+    assert result["practitioner_count"] == 2
+
+def test_malformed_url_does_not_abort_run(server, tmp_path):
+    base_url, _ = server
+    batches = []
+    asyncio.run(enrich_sites(
+        [(1, "http://example.com:abc"), (2, "http://exa\x01mple.com"), (3, "http://[bad"), (4, f"{base_url}/ok")],
+        limiter=HostLimiter(delay=0), cache_dir=str(tmp_path), on_batch=batches.append, batch_size=2
+    ))
+
+    by_id = {r["leads_id"]: r for batch in batches for r in batch}
+    assert sorted(by_id) == [1, 2, 3, 4]
+    assert all(by_id[i]["status"] is None and not by_id[i]["fetched"] for i in (1, 2, 3))
+    assert by_id[4]["status"] == 200
+
+def test_run_website_enrichment_writes_table(server, tmp_path):
+    base_url, _ = server
+    db_file = str(tmp_path / "records.db")
+    conn = connect(db_file)
+    conn.execute(LEADS_TABLE_SCHEMA)
+    conn.executemany(
+        "INSERT INTO leads (clinic_name, email, website_url) VALUES (?, ?, ?)",
+        [("Smile Dental", "a@example.com", f"{base_url}/a"), ("No Site", "b@example.com", None)]
+    )
+    conn.commit()
+    conn.close()
+
+    run_website_enrichment(db_file=db_file, cache_dir=str(tmp_path / "cache"))
+
+    rows = sqlite3.connect(db_file).execute(
+        "SELECT leads_id, http_status, practitioner_count, has_blog FROM lead_website_features"
+    ).fetchall()
+    assert rows == [(1, 200, 2, 1)]